@@ -0,0 +1,194 @@
+"""
+Serving backends for the public transport classifier.
+
+  - savedmodel:  model/public_transport_model through TensorFlow/Keras (default)
+  - tflite_fp16: model/public_transport_fp16.tflite, float16 weights
+  - tflite_int8: model/public_transport_int8.tflite, int8 weights and activations
+
+The .tflite files are produced by convert_tflite.py. TFLite models run in
+the standalone tflite_runtime / ai_edge_litert interpreter when installed
+(no TensorFlow import at all), otherwise in tf.lite. They expose the same
+predict(batch, verbose=0) call as the Keras model, so callers don't change;
+Keras models are wrapped by compile_model for the same reason.
+Pick a backend with PT_BACKEND.
+"""
+import io
+import os
+import threading
+
+import numpy as np
+from PIL import Image
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "model")
+SAVEDMODEL_PATH = os.path.join(MODEL_DIR, "public_transport_model")
+TFLITE_PATHS = {
+    "tflite_fp16": os.path.join(MODEL_DIR, "public_transport_fp16.tflite"),
+    "tflite_int8": os.path.join(MODEL_DIR, "public_transport_int8.tflite"),
+}
+BACKENDS = ("savedmodel",) + tuple(TFLITE_PATHS)
+IMG_SIZE = (224, 224)
+
+
+def backend_path(backend):
+    """Model file/directory served by backend"""
+    if backend == "savedmodel":
+        return SAVEDMODEL_PATH
+    try:
+        return TFLITE_PATHS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown backend: {backend} (choose from {', '.join(BACKENDS)})")
+
+
+def preprocess(source, img_size=IMG_SIZE):
+    """
+    Image path or encoded bytes -> (h, w, 3) float32 MobileNetV2 input.
+    Same result as keras load_img(target_size) + mobilenet_v2.preprocess_input,
+    without importing TensorFlow.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    with Image.open(source) as img:
+        img = img.convert("RGB").resize((img_size[1], img_size[0]), Image.NEAREST)
+        x = np.asarray(img, dtype=np.float32)
+    return x / 127.5 - 1.0
+
+
+def _interpreter_class():
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        try:
+            from ai_edge_litert.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+
+class _BucketInterpreter:
+    """One interpreter whose input is allocated once for a fixed batch size"""
+
+    def __init__(self, model_path, num_threads, batch):
+        self.batch = batch
+        self.interpreter = _interpreter_class()(model_path=model_path, num_threads=num_threads)
+        inp = self.interpreter.get_input_details()[0]
+        if int(inp["shape"][0]) != batch:
+            self.interpreter.resize_tensor_input(inp["index"], [batch, *inp["shape"][1:]])
+        self.interpreter.allocate_tensors()
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self.lock = threading.Lock()
+
+    def run(self, x):
+        """x: (batch, h, w, c) float32, exactly self.batch rows"""
+        scale, zero = self.input["quantization"]
+        if self.input["dtype"] != np.float32:
+            x = np.round(x / scale + zero).astype(self.input["dtype"])
+        with self.lock:
+            self.interpreter.set_tensor(self.input["index"], x)
+            self.interpreter.invoke()
+            out = self.interpreter.get_tensor(self.output["index"])
+        if self.output["dtype"] != np.float32:
+            scale, zero = self.output["quantization"]
+            out = (out.astype(np.float32) - zero) * scale
+        return out
+
+
+class TFLiteClassifier:
+    """
+    TFLite interpreter with a Keras-like predict(); safe to call from several threads.
+
+    Resizing the input and re-running allocate_tensors() on every new batch
+    size is expensive, and the micro-batcher sends batches of varying size.
+    So one interpreter is allocated per power-of-two batch size up to
+    max_batch_size, and each batch is zero-padded to the next size (at most
+    2x wasted rows); larger batches run in max_batch_size chunks.
+    """
+
+    model_type = "transfer"  # MobileNetV2 preprocessing, see predict.detect_model_type
+    layers = ()
+
+    def __init__(self, model_path, num_threads=None, max_batch_size=8):
+        self.model_path = model_path
+        self.max_batch_size = max(1, int(max_batch_size))
+        sizes = sorted({min(1 << i, self.max_batch_size) for i in range(self.max_batch_size.bit_length() + 1)})
+        self._buckets = [_BucketInterpreter(model_path, num_threads, size) for size in sizes]
+
+    @property
+    def param_bytes(self):
+        return os.path.getsize(self.model_path)
+
+    def _bucket(self, n):
+        return next(b for b in self._buckets if b.batch >= n)
+
+    def predict(self, batch, verbose=0):
+        """(n, 224, 224, 3) preprocessed float batch -> (n, num_classes) probabilities"""
+        batch = np.asarray(batch, dtype=np.float32)
+        if batch.shape[0] == 0:
+            return np.zeros((0, int(self._buckets[0].output["shape"][-1])), dtype=np.float32)
+        outputs = []
+        for start in range(0, batch.shape[0], self.max_batch_size):
+            chunk = batch[start:start + self.max_batch_size]
+            n = chunk.shape[0]
+            bucket = self._bucket(n)
+            if n < bucket.batch:
+                chunk = np.concatenate([chunk, np.zeros((bucket.batch - n, *chunk.shape[1:]), np.float32)])
+            outputs.append(bucket.run(chunk)[:n])
+        return np.concatenate(outputs) if len(outputs) != 1 else outputs[0]
+
+
+class CompiledKerasClassifier:
+    """
+    Keras model behind a tf.function with a fixed [None, h, w, c] float32
+    signature: traced once (batch size is dynamic) and warmed up at load, so
+    predict() skips Keras' per-call data adapter and step machinery. Other
+    attributes (layers, weights, ...) come from the wrapped model.
+    """
+
+    def __init__(self, model, jit_compile=False):
+        import tensorflow as tf
+
+        self.keras_model = model
+        shape = getattr(model, "input_shape", None)
+        if isinstance(shape, list):
+            shape = shape[0]
+        if not shape or len(shape) != 4 or None in shape[1:]:
+            shape = (None, *IMG_SIZE, 3)
+        self.input_shape = (None, *shape[1:])
+        spec = tf.TensorSpec(shape=self.input_shape, dtype=tf.float32, name="images")
+
+        @tf.function(input_signature=[spec], jit_compile=jit_compile)
+        def infer(images):
+            outputs = model(images, training=False)
+            if isinstance(outputs, dict):
+                outputs = list(outputs.values())[0]
+            return outputs
+
+        self._infer = infer
+        infer(tf.zeros((1, *self.input_shape[1:]), dtype=tf.float32))  # trace + warm up
+
+    def __getattr__(self, name):
+        if name == "keras_model":
+            raise AttributeError(name)
+        return getattr(self.keras_model, name)
+
+    def predict(self, batch, verbose=0):
+        """(n, h, w, c) preprocessed batch -> (n, num_classes) probabilities as numpy"""
+        return self._infer(np.asarray(batch, dtype=np.float32)).numpy()
+
+    def __call__(self, batch):
+        return self.predict(batch)
+
+
+def compile_model(model, jit_compile=False):
+    """Wrap a Keras model in CompiledKerasClassifier; TFLite and already compiled models pass through"""
+    if isinstance(model, (TFLiteClassifier, CompiledKerasClassifier)):
+        return model
+    return CompiledKerasClassifier(model, jit_compile=jit_compile)
+
+
+def load_tflite(backend, num_threads=None, max_batch_size=8):
+    path = backend_path(backend)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{backend} model not found at {path} (run convert_tflite.py)")
+    return TFLiteClassifier(path, num_threads=num_threads, max_batch_size=max_batch_size)
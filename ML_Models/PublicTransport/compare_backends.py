@@ -0,0 +1,127 @@
+"""
+Latency / memory / accuracy report for the public transport backends.
+
+Each backend (savedmodel, tflite_fp16, tflite_int8; see backends.py) runs in
+its own process so load time and resident memory are measured cleanly.
+Every image in test_images is classified one at a time; accuracy uses the
+ground truth from the filename (as in test_model.py) and agreement is the
+share of top-1 predictions matching the SavedModel.
+
+Usage:
+    python compare_backends.py [--backends savedmodel tflite_fp16 tflite_int8] [--output backend_report.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TEST_DIR = os.path.join(HERE, "test_images")
+IMAGE_EXTS = (".jpg", ".jpeg", ".png")
+GROUND_TRUTH = {"auto": "auto_rickshaw", "bus": "bus", "metro": "metro", "img": "not_transport"}
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def ground_truth(filename):
+    name = os.path.splitext(filename)[0].lower()
+    return next((label for prefix, label in GROUND_TRUTH.items() if name.startswith(prefix)), None)
+
+
+def run_backend(backend):
+    """Child process: load backend, classify every test image, print JSON"""
+    sys.path.insert(0, HERE)
+    os.chdir(HERE)  # predict.MODEL_PATH is relative
+    from backends import preprocess, backend_path
+
+    rss0 = _rss_bytes()
+    t0 = time.perf_counter()
+    from predict import load_model, CLASS_NAMES
+    model = load_model(backend)
+    load_s = time.perf_counter() - t0
+
+    files = sorted(f for f in os.listdir(TEST_DIR) if f.lower().endswith(IMAGE_EXTS))
+    model.predict(preprocess(os.path.join(TEST_DIR, files[0]))[None], verbose=0)  # warm up
+    latencies, predictions = [], []
+    for f in files:
+        t = time.perf_counter()
+        probs = model.predict(preprocess(os.path.join(TEST_DIR, f))[None], verbose=0)[0]
+        latencies.append((time.perf_counter() - t) * 1e3)
+        predictions.append(CLASS_NAMES[int(np.argmax(probs))])
+    rss1 = _rss_bytes()
+
+    path = backend_path(backend)
+    if os.path.isdir(path):
+        size = sum(os.path.getsize(os.path.join(r, f)) for r, _, fs in os.walk(path) for f in fs)
+    else:
+        size = os.path.getsize(path)
+    print(json.dumps({
+        "backend": backend,
+        "model_bytes": size,
+        "load_s": load_s,
+        "rss_bytes": rss1,
+        "rss_delta_bytes": rss1 - rss0 if rss0 is not None and rss1 is not None else None,
+        "latency_ms_mean": float(np.mean(latencies)),
+        "latency_ms_p95": float(np.percentile(latencies, 95)),
+        "files": files,
+        "predictions": predictions,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", nargs="+", default=["savedmodel", "tflite_fp16", "tflite_int8"])
+    parser.add_argument("--output", default=os.path.join(HERE, "backend_report.json"))
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        run_backend(args.worker)
+        return
+
+    reports = []
+    for backend in args.backends:
+        print(f"Running {backend}...")
+        proc = subprocess.run([sys.executable, __file__, "--worker", backend], capture_output=True, text=True)
+        lines = [l for l in proc.stdout.splitlines() if l.startswith("{")]
+        if proc.returncode != 0 or not lines:
+            print(f"  failed: {(proc.stderr or proc.stdout).strip().splitlines()[-1:]}")
+            continue
+        reports.append(json.loads(lines[-1]))
+    if not reports:
+        sys.exit(1)
+
+    reference = next((r for r in reports if r["backend"] == "savedmodel"), None)
+    print(f"\n{'backend':<12s} {'size MB':>8s} {'load s':>7s} {'RSS MB':>7s} {'mean ms':>8s} {'p95 ms':>7s} "
+          f"{'accuracy':>9s} {'agree':>7s}")
+    print("-" * 74)
+    for r in reports:
+        truth = [ground_truth(f) for f in r["files"]]
+        scored = [(t, p) for t, p in zip(truth, r["predictions"]) if t is not None]
+        r["accuracy"] = sum(t == p for t, p in scored) / len(scored) if scored else None
+        r["agreement_with_savedmodel"] = (
+            float(np.mean([a == b for a, b in zip(r["predictions"], reference["predictions"])]))
+            if reference else None
+        )
+        acc = f"{r['accuracy']:.1%}" if r["accuracy"] is not None else "-"
+        agree = f"{r['agreement_with_savedmodel']:.1%}" if r["agreement_with_savedmodel"] is not None else "-"
+        rss = f"{r['rss_bytes'] / 1e6:.0f}" if r["rss_bytes"] else "-"
+        print(f"{r['backend']:<12s} {r['model_bytes'] / 1e6:>8.1f} {r['load_s']:>7.2f} {rss:>7s} "
+              f"{r['latency_ms_mean']:>8.2f} {r['latency_ms_p95']:>7.2f} {acc:>9s} {agree:>7s}")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"test_dir": TEST_DIR, "backends": reports}, f, indent=2)
+    print(f"\nReport saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
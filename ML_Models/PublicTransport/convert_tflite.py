@@ -0,0 +1,78 @@
+"""
+Convert the public transport SavedModel to TFLite.
+
+  - public_transport_fp16.tflite: float16 weights, float compute (~half size)
+  - public_transport_int8.tflite: full integer quantization, calibrated on
+    --calib-dir images (representative dataset); float input/output
+
+Calibrate on training-like images, not on test_images, or the accuracy
+in compare_backends.py is optimistic.
+
+Usage:
+    python convert_tflite.py [--variants fp16 int8] --calib-dir ../path/to/train_images [--calib-limit 200]
+"""
+import argparse
+import os
+import sys
+
+import tensorflow as tf
+
+from backends import SAVEDMODEL_PATH, TFLITE_PATHS, preprocess
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+
+def calibration_paths(calib_dir, limit):
+    paths = []
+    for root, _, files in os.walk(calib_dir):
+        paths.extend(os.path.join(root, f) for f in files if f.lower().endswith(IMAGE_EXTS))
+    paths = sorted(paths)[:limit]
+    if not paths:
+        raise ValueError(f"No calibration images in {calib_dir}")
+    return paths
+
+
+def convert(variant, calib_dir=None, calib_limit=200):
+    converter = tf.lite.TFLiteConverter.from_saved_model(SAVEDMODEL_PATH)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if variant == "fp16":
+        converter.target_spec.supported_types = [tf.float16]
+    else:
+        paths = calibration_paths(calib_dir, calib_limit)
+
+        def representative_dataset():
+            for path in paths:
+                yield [preprocess(path)[None]]
+
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        print(f"   calibrating on {len(paths)} images")
+    out_path = TFLITE_PATHS[f"tflite_{variant}"]
+    with open(out_path, "wb") as f:
+        f.write(converter.convert())
+    print(f"✅ {variant}: {out_path} ({os.path.getsize(out_path) / 1e6:.1f} MB)")
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--variants", nargs="+", choices=("fp16", "int8"), default=["fp16", "int8"])
+    parser.add_argument("--calib-dir", help="representative images for int8")
+    parser.add_argument("--calib-limit", type=int, default=200)
+    args = parser.parse_args()
+    if "int8" in args.variants and not args.calib_dir:
+        parser.error("int8 needs --calib-dir")
+
+    failed = False
+    for variant in args.variants:
+        print(f"🔄 Converting {SAVEDMODEL_PATH} to TFLite {variant}...")
+        try:
+            convert(variant, args.calib_dir, args.calib_limit)
+        except Exception as e:
+            print(f"❌ {variant} conversion failed: {e}")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
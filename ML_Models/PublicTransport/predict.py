@@ -1,9 +1,9 @@
 import sys
 import os
-import tensorflow as tf
 import numpy as np
-from tensorflow.keras.preprocessing import image
-from tensorflow.keras.applications.mobilenet_v2 import preprocess_input
+
+# TensorFlow is imported only where needed, so TFLite backends run without it
+from backends import BACKENDS, compile_model, load_tflite, preprocess
 
 # ---------------- CONFIG ----------------
 # For transfer learning model (MobileNetV2)
@@ -17,6 +17,9 @@ MODEL_PATH = os.path.join(
     "public_transport_model"  # SavedModel directory (no extension)
 )
 
+# savedmodel (default) | tflite_fp16 | tflite_int8, see backends.py
+BACKEND = os.environ.get("PT_BACKEND", "savedmodel")
+
 # Classes MUST match folder names (alphabetical order used by Keras)
 CLASS_NAMES = [
     "auto_rickshaw",
@@ -27,10 +30,25 @@ CLASS_NAMES = [
 # ----------------------------------------
 
 
-def load_model():
+def load_model(backend=None):
+    """
+    Load the configured backend. Keras models come back wrapped in a compiled,
+    warmed-up inference function (backends.compile_model); model.predict()
+    works the same for every backend.
+    """
+    backend = backend or BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend} (choose from {', '.join(BACKENDS)})")
+    if backend != "savedmodel":
+        print(f"Loading {backend} model...")
+        model = load_tflite(backend, max_batch_size=1)  # one image at a time here
+        print(f"✓ Model loaded successfully ({model.model_path})")
+        return model
+
     if not os.path.exists(MODEL_PATH):
         raise FileNotFoundError(f"Model not found at: {MODEL_PATH}")
 
+    import tensorflow as tf
     print("Loading model...")
     
     # Keras 3 requires using TFSMLayer for SavedModel format
@@ -38,7 +56,7 @@ def load_model():
         # Try loading as Keras model first (for .keras or .h5 files)
         model = tf.keras.models.load_model(MODEL_PATH)
         print("✓ Model loaded successfully")
-        return model
+        return compile_model(model)
     except ValueError:
         # If that fails, it's a SavedModel - wrap it in TFSMLayer for Keras 3
         print("Loading SavedModel with TFSMLayer (Keras 3)...")
@@ -58,13 +76,17 @@ def load_model():
         
         model = tf.keras.Model(inputs=inputs, outputs=outputs)
         print("✓ Model loaded successfully (SavedModel with TFSMLayer)")
-        return model
+        return compile_model(model)
 
 
 def detect_model_type(model):
     """
     Detect if the model is transfer learning (MobileNetV2) or basic CNN
     """
+    # TFLite backends declare their type
+    if getattr(model, "model_type", None) == 'transfer':
+        return 'transfer', IMG_SIZE_TRANSFER
+
     # Check if model contains MobileNetV2 layers
     for layer in model.layers:
         if 'mobilenet' in layer.name.lower() or 'tfsm' in layer.name.lower():
@@ -78,6 +100,7 @@ def predict_image_basic(img_path, model, img_size):
     if not os.path.exists(img_path):
         raise FileNotFoundError(f"Image not found: {img_path}")
 
+    from tensorflow.keras.preprocessing import image
     img = image.load_img(img_path, target_size=img_size)
     img_array = image.img_to_array(img)
     img_array = img_array / 255.0
@@ -92,9 +115,7 @@ def predict_image_transfer(img_path, model, img_size):
     if not os.path.exists(img_path):
         raise FileNotFoundError(f"Image not found: {img_path}")
 
-    img = image.load_img(img_path, target_size=img_size)
-    img_array = image.img_to_array(img)
-    img_array = preprocess_input(img_array)  # MobileNetV2 preprocessing
+    img_array = preprocess(img_path, img_size=img_size)  # load_img + MobileNetV2 preprocessing
     img_array = np.expand_dims(img_array, axis=0)
 
     predictions = model.predict(img_array, verbose=0)
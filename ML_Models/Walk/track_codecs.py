@@ -0,0 +1,93 @@
+# Walk/track_codecs.py
+"""
+Compact GPS track encodings.
+
+Besides the JSON list of {lat, lon} objects, a track can be sent as
+  - an encoded polyline string (Google polyline algorithm, precision 5 by default)
+  - a packed little-endian float array of interleaved lat, lon pairs
+    (request body with Content-Type: application/octet-stream)
+Both decode straight into float64 arrays without a per-point Python object.
+"""
+import numpy as np
+
+PACKED_DTYPES = {
+    "f8": np.dtype("<f8"),
+    "f4": np.dtype("<f4"),  # ~0.2 m quantisation at mid latitudes
+}
+
+
+def check_coordinates(lat, lon):
+    """
+    Reject NaN/inf and out-of-range fixes (|lat| <= 90, |lon| <= 180).
+    Returns (lat, lon) unchanged; raises ValueError otherwise.
+    """
+    bad = ~(np.isfinite(lat) & np.isfinite(lon) & (np.abs(lat) <= 90.0) & (np.abs(lon) <= 180.0))
+    if bad.any():
+        i = int(np.argmax(bad))
+        raise ValueError(f"Invalid coordinate at index {i}: lat={lat[i]}, lon={lon[i]}")
+    return lat, lon
+
+
+def decode_polyline(polyline, precision=5):
+    """Decode an encoded polyline string into (lat, lon) float64 arrays"""
+    try:
+        raw = polyline.encode("ascii")
+    except (AttributeError, UnicodeEncodeError):
+        raise ValueError("Polyline must be an ASCII string")
+    if not raw:
+        return np.empty(0), np.empty(0)
+
+    b = np.frombuffer(raw, dtype=np.uint8).astype(np.int64) - 63
+    if b.min() < 0 or b.max() > 63:
+        raise ValueError("Invalid polyline character")
+
+    # every value is a run of 5-bit chunks; a chunk without 0x20 ends the run
+    ends = np.flatnonzero((b & 0x20) == 0)
+    if ends.size == 0 or ends[-1] != b.size - 1:
+        raise ValueError("Truncated polyline")
+    if ends.size % 2:
+        raise ValueError("Polyline has an odd number of values")
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    lengths = ends - starts + 1
+    if lengths.max() > 7:
+        raise ValueError("Polyline value out of range")
+
+    shift = 5 * (np.arange(b.size) - np.repeat(starts, lengths))
+    values = np.add.reduceat((b & 0x1f) << shift, starts)
+    deltas = np.where(values & 1, ~(values >> 1), values >> 1)
+
+    scale = 10.0 ** precision
+    lat = np.cumsum(deltas[0::2]) / scale
+    lon = np.cumsum(deltas[1::2]) / scale
+    return check_coordinates(lat, lon)
+
+
+def encode_polyline(lat, lon, precision=5):
+    """Encode lat/lon sequences as a polyline string (for clients and benchmarks)"""
+    scale = 10.0 ** precision
+    lat_i = np.round(np.asarray(lat, dtype=np.float64) * scale).astype(np.int64)
+    lon_i = np.round(np.asarray(lon, dtype=np.float64) * scale).astype(np.int64)
+    deltas = np.empty(lat_i.size * 2, dtype=np.int64)
+    deltas[0::2] = np.diff(lat_i, prepend=0)
+    deltas[1::2] = np.diff(lon_i, prepend=0)
+
+    out = []
+    for d in deltas.tolist():
+        v = ~(d << 1) if d < 0 else (d << 1)
+        while v >= 0x20:
+            out.append(chr((0x20 | (v & 0x1f)) + 63))
+            v >>= 5
+        out.append(chr(v + 63))
+    return "".join(out)
+
+
+def decode_packed(body, dtype="f8"):
+    """Decode interleaved little-endian lat, lon floats into float64 arrays"""
+    if dtype not in PACKED_DTYPES:
+        raise ValueError(f"Unsupported packed dtype: {dtype}")
+    dt = PACKED_DTYPES[dtype]
+    if len(body) % (2 * dt.itemsize):
+        raise ValueError("Packed track length is not a whole number of lat/lon pairs")
+    arr = np.frombuffer(body, dtype=dt).astype(np.float64)
+    return check_coordinates(arr[0::2].copy(), arr[1::2].copy())
+
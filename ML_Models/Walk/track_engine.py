@@ -0,0 +1,208 @@
+# Walk/track_engine.py
+"""
+Vectorized GPS track engine shared by the walk verification endpoints.
+
+A track is parsed once into two contiguous float64 arrays (lat, lon) and all
+segment distances are computed in a single NumPy pass.
+"""
+from math import radians, sin, cos, sqrt, atan2, isfinite
+import numpy as np
+
+from track_codecs import decode_polyline, decode_packed, check_coordinates
+from track_simplify import simplify_track, DEFAULT_TOLERANCE_M
+
+EARTH_RADIUS_KM = 6371.0
+WALK_THRESHOLD_KM = 2.0
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Calculate distance between two GPS points (scalar reference version)"""
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = sin(dlat / 2)**2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2)**2
+    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+    return EARTH_RADIUS_KM * c  # Distance in km
+
+
+def coords_to_arrays(coords):
+    """
+    Parse a list of {lat, lon} dicts into contiguous float64 arrays.
+    Raises ValueError if a point is malformed.
+    """
+    n = len(coords)
+    try:
+        lat = np.fromiter((c["lat"] for c in coords), dtype=np.float64, count=n)
+        lon = np.fromiter((c["lon"] for c in coords), dtype=np.float64, count=n)
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid coordinate: {e}") from e
+    return check_coordinates(lat, lon)
+
+
+def segment_distances(lat, lon):
+    """Haversine distance (km) of every consecutive segment, shape (n-1,)"""
+    lat_r = np.radians(lat)
+    lon_r = np.radians(lon)
+    dlat = np.diff(lat_r)
+    dlon = np.diff(lon_r)
+    a = np.sin(dlat / 2)**2 + np.cos(lat_r[:-1]) * np.cos(lat_r[1:]) * np.sin(dlon / 2)**2
+    np.clip(a, 0.0, 1.0, out=a)
+    return 2 * EARTH_RADIUS_KM * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def segment_stats(seg):
+    """Summary statistics over an array of segment distances (km)"""
+    if seg.size == 0:
+        return {"count": 0, "max_km": 0.0, "mean_km": 0.0}
+    return {
+        "count": int(seg.size),
+        "max_km": float(seg.max()),
+        "mean_km": float(seg.mean()),
+    }
+
+
+def evaluate_track(lat, lon, threshold_km=WALK_THRESHOLD_KM, simplify=None):
+    """
+    Compute total distance and per-segment stats for one track.
+    simplify: optional {"tolerance_m": float, "max_points": int}; the track is
+    also reduced with track_simplify and the reduction is reported under
+    "simplification", including how much distance it removed. The distance
+    and verdict are always those of the original track.
+    Returns the /verify_walk response body.
+    """
+    if lat.size < 2:
+        raise ValueError("Not enough coordinates")
+    seg = segment_distances(lat, lon)
+    total_distance = float(seg.sum())
+    result = {
+        "total_distance_km": round(total_distance, 2),
+        "walk_valid": total_distance >= threshold_km,
+        "num_points": int(lat.size),
+        "segment_stats": segment_stats(seg),
+    }
+    if simplify is not None:
+        s_lat, s_lon, simplification = simplify_track(lat, lon, **simplify)
+        simplified_distance = float(segment_distances(s_lat, s_lon).sum())
+        simplification["simplified_distance_km"] = round(simplified_distance, 2)
+        # exact, and >= 0: dropping points never lengthens the path
+        simplification["distance_error_km"] = round(max(0.0, total_distance - simplified_distance), 2)
+        result["simplification"] = simplification
+    return result
+
+
+def verify_coordinates(coords, threshold_km=WALK_THRESHOLD_KM):
+    """Verify a walk given as a list of {lat, lon} dicts"""
+    if not coords or len(coords) < 2:
+        raise ValueError("Not enough coordinates")
+    lat, lon = coords_to_arrays(coords)
+    return evaluate_track(lat, lon, threshold_km=threshold_km)
+
+
+def parse_track(track):
+    """
+    Decode any JSON track representation into (lat, lon) arrays.
+    Accepts a bare coordinate list, {"coordinates": [...]} or
+    {"polyline": "...", "precision": 5}. Raises ValueError on bad input.
+    """
+    if isinstance(track, dict):
+        if "polyline" in track:
+            precision = track.get("precision", 5)
+            if not isinstance(precision, int) or not 0 <= precision <= 7:
+                raise ValueError("Polyline precision must be an integer between 0 and 7")
+            return decode_polyline(track["polyline"], precision=precision)
+        track = track.get("coordinates", [])
+    if not isinstance(track, list):
+        raise ValueError("Coordinates must be a list of {lat, lon}")
+    return coords_to_arrays(track)
+
+
+def track_from_request(req):
+    """
+    Read a track from a Flask request.
+    application/octet-stream bodies are packed lat, lon floats (?dtype=f8|f4);
+    anything else is parsed as a JSON track (see parse_track).
+    """
+    if req.mimetype == "application/octet-stream":
+        return decode_packed(req.get_data(cache=False), dtype=req.args.get("dtype", "f8"))
+    return parse_track(req.get_json(silent=True) or {})
+
+
+def simplify_options_from_request(req):
+    """
+    Optional simplification settings, from query args
+    (?simplify=1&tolerance_m=5&max_points=2000) or a JSON "simplify" object.
+    Returns None when simplification was not requested.
+    """
+    opts = None
+    if req.args.get("simplify") not in (None, "", "0", "false"):
+        opts = {k: req.args[k] for k in ("tolerance_m", "max_points") if k in req.args}
+    elif req.mimetype != "application/octet-stream":
+        body = req.get_json(silent=True)
+        if isinstance(body, dict) and body.get("simplify"):
+            opts = body["simplify"] if isinstance(body["simplify"], dict) else {}
+    if opts is None:
+        return None
+    try:
+        tolerance_m = float(opts.get("tolerance_m", DEFAULT_TOLERANCE_M))
+        max_points = opts.get("max_points")
+        max_points = int(max_points) if max_points is not None else None
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("Invalid simplify options")
+    if not isfinite(tolerance_m) or tolerance_m < 0:
+        raise ValueError("tolerance_m must be a finite number >= 0")
+    if max_points is not None and max_points < 2:
+        raise ValueError("max_points must be an integer >= 2")
+    return {"tolerance_m": tolerance_m, "max_points": max_points}
+
+
+def verify_batch(tracks, threshold_km=WALK_THRESHOLD_KM):
+    """
+    Verify many tracks in one array pass.
+    All valid tracks are concatenated, segment distances are computed once,
+    and segments that would cross a track boundary are dropped before the
+    per-track sums. Returns one result per input track, in input order;
+    invalid tracks get {"error": ...} in place.
+    """
+    results = [None] * len(tracks)
+    lats, lons, owners = [], [], []
+    for i, track in enumerate(tracks):
+        try:
+            lat, lon = parse_track(track)
+        except ValueError as e:
+            results[i] = {"error": str(e)}
+            continue
+        if lat.size < 2:
+            results[i] = {"error": "Not enough coordinates"}
+            continue
+        lats.append(lat)
+        lons.append(lon)
+        owners.append(i)
+
+    if not owners:
+        return results
+
+    sizes = np.fromiter((a.size for a in lats), dtype=np.int64, count=len(lats))
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    seg = segment_distances(np.concatenate(lats), np.concatenate(lons))
+
+    # segment k joins point k and k+1; keep it only if both are in the same track
+    keep = np.ones(seg.size, dtype=bool)
+    keep[starts[1:] - 1] = False
+    seg = seg[keep]
+    seg_starts = starts - np.arange(starts.size)  # one boundary segment removed per preceding track
+
+    totals = np.add.reduceat(seg, seg_starts)
+    maxes = np.maximum.reduceat(seg, seg_starts)
+    for j, i in enumerate(owners):
+        total_distance = float(totals[j])
+        count = int(sizes[j] - 1)
+        results[i] = {
+            "total_distance_km": round(total_distance, 2),
+            "walk_valid": total_distance >= threshold_km,
+            "num_points": int(sizes[j]),
+            "segment_stats": {
+                "count": count,
+                "max_km": float(maxes[j]),
+                "mean_km": total_distance / count,
+            },
+        }
+    return results
@@ -0,0 +1,96 @@
+# Walk/track_simplify.py
+"""
+Bounded-deviation track simplification (Douglas-Peucker, worst-segment-first).
+
+The track is projected to local metres (equirectangular around the mean
+latitude) and the segment with the largest deviation is split first. Splitting
+stops once every dropped point lies within tolerance_m of its chord, or once
+max_points have been kept. The returned max_deviation_m is the actual worst
+perpendicular deviation of any dropped point, so it is a guaranteed bound
+either way.
+
+The bound is on position, not on path length: GPS jitter within tolerance_m
+of the chord can add a lot of distance that the reduced track no longer has.
+evaluate_track therefore measures distance on the original track and reports
+the exact distance removed. This is an extra O(n log n) pass on top of the
+O(n) distance computation, not a way to make long tracks cheaper.
+"""
+import heapq
+import math
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+DEFAULT_TOLERANCE_M = 5.0
+
+
+def _project(lat, lon):
+    lat0 = np.radians(lat.mean())
+    x = np.radians(lon - lon[0]) * np.cos(lat0) * EARTH_RADIUS_M
+    y = np.radians(lat - lat[0]) * EARTH_RADIUS_M
+    return x, y
+
+
+def _farthest(x, y, i, j):
+    """Largest distance of points i+1..j-1 from segment i-j, and its index"""
+    if j - i < 2:
+        return 0.0, -1
+    px = x[i + 1:j] - x[i]
+    py = y[i + 1:j] - y[i]
+    dx = x[j] - x[i]
+    dy = y[j] - y[i]
+    seg_len2 = dx * dx + dy * dy
+    if seg_len2 > 0:
+        t = np.clip((px * dx + py * dy) / seg_len2, 0.0, 1.0)
+        px = px - t * dx
+        py = py - t * dy
+    d = np.hypot(px, py)
+    k = int(np.argmax(d))
+    return float(d[k]), i + 1 + k
+
+
+def simplify_track(lat, lon, tolerance_m=DEFAULT_TOLERANCE_M, max_points=None):
+    """
+    Simplify a track given as lat/lon arrays.
+    Returns (lat, lon, info) where info has original_points, reduced_points,
+    tolerance_m, max_points and max_deviation_m.
+    """
+    if not math.isfinite(tolerance_m) or tolerance_m < 0:
+        raise ValueError("tolerance_m must be a finite number >= 0")
+    if max_points is not None:
+        if not math.isfinite(max_points) or max_points != int(max_points) or max_points < 2:
+            raise ValueError("max_points must be an integer >= 2")
+        max_points = int(max_points)
+
+    n = lat.size
+    info = {
+        "original_points": int(n),
+        "reduced_points": int(n),
+        "tolerance_m": float(tolerance_m),
+        "max_points": max_points,
+        "max_deviation_m": 0.0,
+    }
+    if n <= 2:
+        return lat, lon, info
+
+    x, y = _project(lat, lon)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    kept = 2
+
+    d, k = _farthest(x, y, 0, n - 1)
+    heap = [(-d, 0, n - 1, k)]
+    while heap:
+        d = -heap[0][0]
+        if d <= tolerance_m or (max_points is not None and kept >= max_points):
+            break
+        _, i, j, k = heapq.heappop(heap)
+        keep[k] = True
+        kept += 1
+        for a, b in ((i, k), (k, j)):
+            if b - a >= 2:
+                da, ka = _farthest(x, y, a, b)
+                heapq.heappush(heap, (-da, a, b, ka))
+
+    info["reduced_points"] = kept
+    info["max_deviation_m"] = -heap[0][0] if heap else 0.0
+    return lat[keep], lon[keep], info
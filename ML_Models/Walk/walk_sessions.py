@@ -0,0 +1,210 @@
+# Walk/walk_sessions.py
+"""
+Incremental walk sessions.
+
+Clients open a session, append GPS chunks as the walk goes on, and read the
+running total. Only the last fix and the running aggregates are kept per
+session; the track itself is never stored.
+
+Sessions live in a SQLite file, so every web server process on the host
+(e.g. several gunicorn workers) sees the same sessions and an append may land
+on any of them. Each read-modify-write runs in its own IMMEDIATE transaction.
+Sessions idle for longer than ttl_s are treated as gone on every access, and
+each client (the X-Client-Id the backend sets to the authenticated user's
+id) may hold at most max_per_client open sessions.
+"""
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+import numpy as np
+
+from track_engine import segment_distances, WALK_THRESHOLD_KM
+
+SESSION_TTL_S = 6 * 60 * 60   # idle sessions are dropped after 6 hours
+MAX_SESSIONS = 10000
+MAX_SESSIONS_PER_CLIENT = 8
+DEFAULT_DB_PATH = os.path.join(tempfile.gettempdir(), "greenid_walk_sessions.sqlite3")
+
+_COLUMNS = ("session_id", "client_id", "threshold_km", "last_lat", "last_lon",
+            "total_km", "num_points", "max_segment_km", "created_at", "updated_at")
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS walk_sessions (
+    session_id TEXT PRIMARY KEY,
+    client_id TEXT NOT NULL,
+    threshold_km REAL NOT NULL,
+    last_lat REAL,
+    last_lon REAL,
+    total_km REAL NOT NULL,
+    num_points INTEGER NOT NULL,
+    max_segment_km REAL NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS walk_sessions_client ON walk_sessions (client_id);
+CREATE INDEX IF NOT EXISTS walk_sessions_updated ON walk_sessions (updated_at);
+"""
+
+
+class WalkSession:
+    __slots__ = _COLUMNS
+
+    def __init__(self, session_id, threshold_km=WALK_THRESHOLD_KM, client_id=""):
+        now = time.time()
+        self.session_id = session_id
+        self.client_id = client_id
+        self.threshold_km = threshold_km
+        self.last_lat = None
+        self.last_lon = None
+        self.total_km = 0.0
+        self.num_points = 0
+        self.max_segment_km = 0.0
+        self.created_at = now
+        self.updated_at = now
+
+    @classmethod
+    def from_row(cls, row):
+        session = cls.__new__(cls)
+        for name, value in zip(_COLUMNS, row):
+            setattr(session, name, value)
+        return session
+
+    def to_row(self):
+        return tuple(getattr(self, name) for name in _COLUMNS)
+
+    def append(self, lat, lon):
+        """Fold a chunk of fixes into the running aggregates"""
+        if lat.size == 0:
+            return
+        if self.last_lat is not None:
+            # stitch the chunk onto the previous fix
+            lat = np.concatenate(([self.last_lat], lat))
+            lon = np.concatenate(([self.last_lon], lon))
+            new_points = lat.size - 1
+        else:
+            new_points = lat.size
+        seg = segment_distances(lat, lon)
+        if seg.size:
+            self.total_km += float(seg.sum())
+            self.max_segment_km = max(self.max_segment_km, float(seg.max()))
+        self.num_points += new_points
+        self.last_lat = float(lat[-1])
+        self.last_lon = float(lon[-1])
+        self.updated_at = time.time()
+
+    def summary(self):
+        return {
+            "session_id": self.session_id,
+            "total_distance_km": round(self.total_km, 2),
+            "walk_valid": self.total_km >= self.threshold_km,
+            "num_points": self.num_points,
+            "max_segment_km": self.max_segment_km,
+        }
+
+
+class WalkSessionStore:
+    """Walk sessions shared by every process using the same SQLite file"""
+
+    def __init__(self, path=DEFAULT_DB_PATH, ttl_s=SESSION_TTL_S, max_sessions=MAX_SESSIONS,
+                 max_per_client=MAX_SESSIONS_PER_CLIENT):
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_sessions = max_sessions
+        self.max_per_client = max_per_client
+        self._local = threading.local()  # one connection per thread
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def _transaction(self):
+        return _Transaction(self._connection())
+
+    def _load(self, db, session_id, now):
+        """Session by id, or None if unknown or idle past the TTL (then deleted)"""
+        row = db.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM walk_sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        session = WalkSession.from_row(row)
+        if now - session.updated_at > self.ttl_s:
+            db.execute("DELETE FROM walk_sessions WHERE session_id = ?", (session_id,))
+            return None
+        return session
+
+    def open(self, threshold_km=WALK_THRESHOLD_KM, client_id=""):
+        """
+        Start a session for client_id. Raises RuntimeError when the client
+        already holds max_per_client sessions or the store is full.
+        """
+        session = WalkSession(uuid.uuid4().hex, threshold_km=threshold_km, client_id=client_id)
+        with self._transaction() as db:
+            db.execute("DELETE FROM walk_sessions WHERE updated_at < ?", (session.created_at - self.ttl_s,))
+            (per_client,) = db.execute(
+                "SELECT COUNT(*) FROM walk_sessions WHERE client_id = ?", (client_id,)
+            ).fetchone()
+            if per_client >= self.max_per_client:
+                raise RuntimeError("Too many open walk sessions for this client")
+            (total,) = db.execute("SELECT COUNT(*) FROM walk_sessions").fetchone()
+            if total >= self.max_sessions:
+                raise RuntimeError("Too many open walk sessions")
+            db.execute(f"INSERT INTO walk_sessions VALUES ({', '.join('?' * len(_COLUMNS))})",
+                       session.to_row())
+        return session
+
+    def get(self, session_id):
+        with self._transaction() as db:
+            return self._load(db, session_id, time.time())
+
+    def append(self, session_id, lat, lon):
+        """Append a chunk of fixes; returns the session or None"""
+        with self._transaction() as db:
+            session = self._load(db, session_id, time.time())
+            if session is None:
+                return None
+            session.append(lat, lon)
+            db.execute(
+                "UPDATE walk_sessions SET last_lat = ?, last_lon = ?, total_km = ?, num_points = ?, "
+                "max_segment_km = ?, updated_at = ? WHERE session_id = ?",
+                (session.last_lat, session.last_lon, session.total_km, session.num_points,
+                 session.max_segment_km, session.updated_at, session_id)
+            )
+        return session
+
+    def close(self, session_id):
+        with self._transaction() as db:
+            session = self._load(db, session_id, time.time())
+            if session is not None:
+                db.execute("DELETE FROM walk_sessions WHERE session_id = ?", (session_id,))
+            return session
+
+    def __len__(self):
+        with self._transaction() as db:
+            (total,) = db.execute(
+                "SELECT COUNT(*) FROM walk_sessions WHERE updated_at >= ?", (time.time() - self.ttl_s,)
+            ).fetchone()
+        return total
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT (ROLLBACK on error) on an autocommit connection"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
@@ -0,0 +1,66 @@
+"""
+Benchmark: cleanup classifier, two predict calls per pair vs classify_batch.
+
+Requires ultralytics and cleanup/model/best.pt. Pass image files to use as
+before/after pairs (consecutive images are paired); otherwise random images
+are generated.
+
+Usage:
+    python benchmarks/bench_cleanup_batch.py [img ...] [--pairs 32] [--batch-sizes 2 16 32]
+"""
+import argparse
+import importlib.util
+import os
+import time
+
+import cv2
+import numpy as np
+
+UTILS_PATH = os.path.join(os.path.dirname(__file__), "..", "cleanup", "utils.py")
+
+
+def load_cleanup_utils():
+    spec = importlib.util.spec_from_file_location("cleanup_utils", UTILS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("images", nargs="*")
+    parser.add_argument("--pairs", type=int, default=32)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[2, 16, 32])
+    args = parser.parse_args()
+
+    cleanup_utils = load_cleanup_utils()
+    model = cleanup_utils.get_model()
+
+    if args.images:
+        images = [cv2.imread(p) for p in args.images]
+    else:
+        rng = np.random.default_rng(0)
+        images = [rng.integers(0, 255, (480, 640, 3), dtype=np.uint8) for _ in range(8)]
+    flat = [images[i % len(images)] for i in range(2 * args.pairs)]
+    pairs = list(zip(flat[0::2], flat[1::2]))
+
+    model.predict(flat[0], verbose=False)  # warm up
+    t0 = time.perf_counter()
+    single = [model.predict(img, verbose=False)[0].probs.top1 for img in flat]
+    t_single = time.perf_counter() - t0
+    print(f"{len(pairs)} pairs")
+    print(f"{'mode':<14s} {'time (s)':>9s} {'pairs/s':>8s} {'speedup':>8s} {'same top1':>10s}")
+    print("-" * 53)
+    print(f"{'2x predict':<14s} {t_single:>9.2f} {len(pairs)/t_single:>8.1f} {1.0:>7.2f}x {'-':>10s}")
+
+    for bs in args.batch_sizes:
+        t0 = time.perf_counter()
+        results = cleanup_utils.verify_cleanup_batch(pairs, batch_size=bs)
+        t = time.perf_counter() - t0
+        top1 = [r[k] for r in results for k in ("before_class", "after_class")]
+        same = top1 == [cleanup_utils.cls_map[c] for c in single]
+        print(f"{'batch=' + str(bs):<14s} {t:>9.2f} {len(pairs)/t:>8.1f} {t_single/t:>7.2f}x {str(same):>10s}")
+
+
+if __name__ == "__main__":
+    main()
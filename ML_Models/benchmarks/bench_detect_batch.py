@@ -0,0 +1,57 @@
+"""
+Benchmark: planting Detector, one frame per forward pass vs detect_batch.
+
+Requires ultralytics (yolov8n.pt is downloaded on first use).
+
+Usage:
+    python benchmarks/bench_detect_batch.py [video.mp4] [--frames 60] [--batch-sizes 1 4 8 16]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "planting"))
+from object_detection.detect_objects import get_detector
+from video_processing.extract_frames import iter_frames
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("video", nargs="?")
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    detector = get_detector()
+    if detector.model is None:
+        print("YOLO not available (is ultralytics installed?)")
+        sys.exit(1)
+
+    if args.video:
+        frames = list(iter_frames(args.video, sample_fps=1, max_frames=args.frames))
+    else:
+        rng = np.random.default_rng(0)
+        frames = [rng.integers(0, 255, (720, 1280, 3), dtype=np.uint8) for _ in range(args.frames)]
+
+    detector.detect(frames[0])  # warm up
+    t0 = time.perf_counter()
+    single = [detector.detect(f) for f in frames]
+    t_single = time.perf_counter() - t0
+    print(f"{'mode':<12s} {'time (s)':>9s} {'fps':>7s} {'speedup':>8s} {'same dets':>10s}")
+    print("-" * 50)
+    print(f"{'detect':<12s} {t_single:>9.2f} {len(frames)/t_single:>7.1f} {1.0:>7.2f}x {'-':>10s}")
+
+    for bs in args.batch_sizes:
+        t0 = time.perf_counter()
+        batched = detector.detect_batch(frames, batch_size=bs)
+        t = time.perf_counter() - t0
+        same = all(len(a) == len(b) and all(x["label"] == y["label"] for x, y in zip(a, b))
+                   for a, b in zip(single, batched))
+        print(f"{'batch=' + str(bs):<12s} {t:>9.2f} {len(frames)/t:>7.1f} {t_single/t:>7.2f}x {str(same):>10s}")
+
+
+if __name__ == "__main__":
+    main()
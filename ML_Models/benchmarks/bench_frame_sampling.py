@@ -0,0 +1,74 @@
+"""
+Benchmark: frame sampling modes of planting's iter_frames.
+
+Compares the legacy read-every-frame loop with grab()-skipping and seeking
+on 30 and 60 fps videos at sample_fps=1. Without arguments it synthesises
+two 1080p test clips; pass real phone videos to measure those instead.
+
+Usage:
+    python benchmarks/bench_frame_sampling.py [video.mp4 ...] [--max-frames 60]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "planting"))
+from video_processing.extract_frames import iter_frames, SAMPLING_MODES
+
+
+def synth_video(path, fps, seconds=20, size=(1920, 1080)):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+    rng = np.random.default_rng(fps)
+    base = rng.integers(0, 255, (size[1] // 8, size[0] // 8, 3), dtype=np.uint8)
+    base = cv2.resize(base, size, interpolation=cv2.INTER_LINEAR)
+    for i in range(int(fps * seconds)):
+        frame = np.roll(base, i * 4, axis=1)
+        cv2.putText(frame, str(i), (50, 150), cv2.FONT_HERSHEY_SIMPLEX, 4, (255, 255, 255), 8)
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+def run(video, mode, max_frames):
+    t0 = time.perf_counter()
+    frames = list(iter_frames(video, sample_fps=1, max_frames=max_frames, mode=mode))
+    return time.perf_counter() - t0, frames
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("videos", nargs="*")
+    parser.add_argument("--max-frames", type=int, default=60)
+    args = parser.parse_args()
+
+    videos = args.videos
+    if not videos:
+        tmp = tempfile.mkdtemp(prefix="bench_sampling_")
+        print("Synthesising 1080p test clips...")
+        videos = [synth_video(os.path.join(tmp, f"clip_{fps}fps.mp4"), fps) for fps in (30, 60)]
+
+    for video in videos:
+        cap = cv2.VideoCapture(video)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+        print(f"\n{os.path.basename(video)}: {fps:.0f} fps, {total} frames")
+        print(f"{'mode':<6s} {'time (ms)':>10s} {'kept':>5s} {'speedup':>8s} {'same frames':>12s}")
+        print("-" * 46)
+
+        base_time, base_frames = run(video, "read", args.max_frames)
+        for mode in ("read",) + tuple(m for m in SAMPLING_MODES if m != "read"):
+            t, frames = (base_time, base_frames) if mode == "read" else run(video, mode, args.max_frames)
+            same = len(frames) == len(base_frames) and all(
+                np.array_equal(a, b) for a, b in zip(frames, base_frames)
+            )
+            print(f"{mode:<6s} {t*1e3:>10.1f} {len(frames):>5d} {base_time/t:>7.2f}x {str(same):>12s}")
+
+
+if __name__ == "__main__":
+    main()
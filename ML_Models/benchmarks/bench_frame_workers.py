@@ -0,0 +1,61 @@
+"""
+Benchmark: planting verification with 1..N per-frame analysis threads.
+
+Runs verify_planting_from_stream on the same decoded frames with each
+worker count and checks the evidence matches the single-threaded run.
+Requires ultralytics for the detection cost to be realistic.
+
+Usage:
+    python benchmarks/bench_frame_workers.py video.mp4 [--frames 60] [--workers 1 2 4] [--motion-backend farneback]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "planting"))
+from object_detection.detect_objects import get_detector
+from video_processing.extract_frames import iter_frames
+from video_processing.motion import get_motion_estimator
+from video_processing.verify_video import verify_planting_from_stream
+
+KEYS = ("num_frames", "person_frames", "plant_frames", "avg_motion", "reason")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("video")
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--sample-fps", type=float, default=2)
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--motion-backend", default="farneback")
+    args = parser.parse_args()
+
+    detector = get_detector()
+    if detector.model is None:
+        print("YOLO not available (is ultralytics installed?); timing green-blob fallback only")
+    frames = list(iter_frames(args.video, sample_fps=args.sample_fps, max_frames=args.frames))
+    estimator = get_motion_estimator(args.motion_backend, roi_only=True)
+
+    print(f"{len(frames)} frames, batch_size={args.batch_size}, motion={args.motion_backend}\n")
+    print(f"{'workers':>7s} {'time (s)':>9s} {'fps':>7s} {'speedup':>8s} {'same evidence':>14s}")
+    print("-" * 50)
+    base = None
+    for workers in args.workers:
+        run = lambda: verify_planting_from_stream(iter(frames), motion_threshold=0.6, detector=detector,
+                                                  batch_size=args.batch_size, motion_estimator=estimator,
+                                                  workers=workers)
+        run()  # warm up threads and their detector clones
+        t0 = time.perf_counter()
+        _, evidence = run()
+        t = time.perf_counter() - t0
+        summary = {k: evidence.get(k) for k in KEYS}
+        if base is None:
+            base = (t, summary)
+        same = summary == base[1]
+        print(f"{workers:>7d} {t:>9.2f} {len(frames)/t:>7.1f} {base[0]/t:>7.2f}x {str(same):>14s}")
+
+
+if __name__ == "__main__":
+    main()
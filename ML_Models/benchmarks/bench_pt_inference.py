@@ -0,0 +1,58 @@
+"""
+Benchmark: public transport model, Keras predict() vs the compiled
+fixed-signature inference function (PublicTransport/backends.compile_model).
+
+Times single-image calls (the CLI / test_model.py pattern) and batches
+(the service's micro-batcher) and checks both paths return the same
+probabilities. Requires TensorFlow.
+
+Usage:
+    python benchmarks/bench_pt_inference.py [--calls 50] [--batch-sizes 1 8]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+PT_DIR = os.path.join(os.path.dirname(__file__), "..", "PublicTransport")
+sys.path.insert(0, PT_DIR)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8])
+    args = parser.parse_args()
+
+    os.chdir(PT_DIR)  # predict.MODEL_PATH is relative
+    from predict import load_model
+
+    t0 = time.perf_counter()
+    compiled = load_model("savedmodel")
+    print(f"load + trace + warm-up: {time.perf_counter() - t0:.2f}s\n")
+    keras_model = compiled.keras_model
+
+    rng = np.random.default_rng(0)
+    print(f"{'batch':>5s} {'keras ms':>9s} {'compiled ms':>12s} {'speedup':>8s} {'max |dp|':>9s}")
+    print("-" * 48)
+    for bs in args.batch_sizes:
+        batch = rng.uniform(-1, 1, (bs, 224, 224, 3)).astype(np.float32)
+        ref = keras_model.predict(batch, verbose=0)  # warm up Keras' own path
+        out = compiled.predict(batch)
+
+        t0 = time.perf_counter()
+        for _ in range(args.calls):
+            keras_model.predict(batch, verbose=0)
+        t_keras = (time.perf_counter() - t0) * 1e3 / args.calls
+        t0 = time.perf_counter()
+        for _ in range(args.calls):
+            compiled.predict(batch)
+        t_compiled = (time.perf_counter() - t0) * 1e3 / args.calls
+        diff = float(np.abs(np.asarray(ref) - out).max())
+        print(f"{bs:>5d} {t_keras:>9.2f} {t_compiled:>12.2f} {t_keras / t_compiled:>7.2f}x {diff:>9.2e}")
+
+
+if __name__ == "__main__":
+    main()
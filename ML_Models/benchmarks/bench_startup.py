@@ -0,0 +1,75 @@
+"""
+Benchmark: ML service cold start.
+
+Measures, in fresh interpreters, how long `import ml_service` takes (the time
+before Flask can serve /verify_walk) and, with --warmup, how long each model
+takes to load through the registry.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--warmup] [--max-import-s 2.0]
+
+Exits non-zero if the median import time exceeds --max-import-s, so it can be
+used as a regression check.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ML_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+PROBE = r"""
+import json, time
+t0 = time.perf_counter()
+import ml_service
+import_s = time.perf_counter() - t0
+models = {}
+if WARMUP:
+    ml_service.registry.warmup(background=False)
+    models = ml_service.registry.status()
+print("RESULT" + json.dumps({"import_s": import_s, "models": models}))
+"""
+
+
+def run_once(warmup):
+    code = f"WARMUP = {bool(warmup)}\n" + PROBE
+    env = dict(os.environ, ML_WARMUP="")
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ML_DIR, env=env,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    line = [l for l in out.splitlines() if l.startswith("RESULT")][-1]
+    return json.loads(line[len("RESULT"):])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--warmup", action="store_true", help="also load every model")
+    parser.add_argument("--max-import-s", type=float, default=None)
+    args = parser.parse_args()
+
+    runs = [run_once(args.warmup) for _ in range(args.runs)]
+    import_times = [r["import_s"] for r in runs]
+    median = statistics.median(import_times)
+    print(f"import ml_service: median {median*1e3:.1f} ms "
+          f"(min {min(import_times)*1e3:.1f}, max {max(import_times)*1e3:.1f}) over {args.runs} runs")
+
+    if args.warmup:
+        print(f"\n{'model':<20s} {'state':<12s} {'load (s)':>9s}")
+        print("-" * 43)
+        for name in runs[0]["models"]:
+            states = {r["models"][name]["state"] for r in runs}
+            loads = [r["models"][name]["load_time_s"] for r in runs if r["models"][name]["load_time_s"]]
+            load = f"{statistics.median(loads):.2f}" if loads else "-"
+            print(f"{name:<20s} {'/'.join(sorted(states)):<12s} {load:>9s}")
+
+    if args.max_import_s is not None and median > args.max_import_s:
+        print(f"\nFAIL: import time {median:.2f}s exceeds {args.max_import_s:.2f}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
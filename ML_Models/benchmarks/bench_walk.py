@@ -0,0 +1,76 @@
+"""
+Benchmark: legacy per-segment haversine loop vs the vectorized track engine,
+and request size / parse time of the supported track encodings.
+
+Usage:
+    python benchmarks/bench_walk.py
+"""
+import json
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "Walk"))
+from track_engine import haversine, verify_coordinates, coords_to_arrays
+from track_codecs import encode_polyline, decode_polyline, decode_packed
+
+
+def make_track(n, seed=0):
+    """Random-walk track of n fixes around Delhi, ~1 Hz walking pace"""
+    rng = np.random.default_rng(seed)
+    lat = 28.6139 + np.cumsum(rng.normal(0, 1e-5, n))
+    lon = 77.2090 + np.cumsum(rng.normal(0, 1e-5, n))
+    return [{"lat": float(a), "lon": float(b)} for a, b in zip(lat, lon)]
+
+
+def legacy_total(coords):
+    total_distance = 0.0
+    for i in range(len(coords) - 1):
+        lat1, lon1 = coords[i]["lat"], coords[i]["lon"]
+        lat2, lon2 = coords[i+1]["lat"], coords[i+1]["lon"]
+        total_distance += haversine(lat1, lon1, lat2, lon2)
+    return total_distance
+
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    print(f"{'points':>8s} {'legacy (ms)':>12s} {'engine (ms)':>12s} {'speedup':>8s}")
+    print("-" * 44)
+    for n in (1_000, 10_000, 100_000):
+        coords = make_track(n)
+        legacy = legacy_total(coords)
+        engine = verify_coordinates(coords)
+        assert abs(round(legacy, 2) - engine["total_distance_km"]) < 1e-9
+
+        t_legacy = best_of(lambda: legacy_total(coords))
+        t_engine = best_of(lambda: verify_coordinates(coords))
+        print(f"{n:>8d} {t_legacy*1e3:>12.2f} {t_engine*1e3:>12.2f} {t_legacy/t_engine:>7.1f}x")
+
+    print(f"\n{'points':>8s} {'encoding':>9s} {'bytes':>10s} {'parse (ms)':>11s}")
+    print("-" * 42)
+    for n in (1_000, 10_000, 100_000):
+        coords = make_track(n)
+        lat, lon = coords_to_arrays(coords)
+        as_json = json.dumps({"coordinates": coords})
+        as_polyline = encode_polyline(lat, lon)
+        as_packed = np.column_stack((lat, lon)).astype("<f8").tobytes()
+        cases = [
+            ("json", len(as_json), lambda: coords_to_arrays(json.loads(as_json)["coordinates"])),
+            ("polyline", len(as_polyline), lambda: decode_polyline(as_polyline)),
+            ("packed", len(as_packed), lambda: decode_packed(as_packed)),
+        ]
+        for name, size, fn in cases:
+            print(f"{n:>8d} {name:>9s} {size:>10d} {best_of(fn)*1e3:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
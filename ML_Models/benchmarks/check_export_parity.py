@@ -0,0 +1,137 @@
+"""
+Accuracy/latency parity of exported YOLO models (export_yolo.py) against
+the PyTorch weights.
+
+  - cleanup: top-1 agreement and max probability difference per image
+  - planting: detections matched by label and IoU >= 0.5 (recall/precision
+    of the export relative to PyTorch) and agreement of the per-frame
+    person/plant evidence used by verify_planting_from_stream
+
+Exits non-zero when an agreement rate falls below --min-agreement.
+
+Usage:
+    python benchmarks/check_export_parity.py --images imgs/ [--cleanup cleanup/model/best.int8.onnx]
+        [--planting yolov8n.int8.onnx] [--video clip.mp4] [--min-agreement 0.95]
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(BASE_DIR, "planting"))
+from object_detection.detect_objects import Detector
+from video_processing.extract_frames import iter_frames
+from video_processing.verify_video import analyse_frame
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+# Always the PyTorch weights, not whatever CLEANUP_MODEL_PATH / PLANTING_MODEL_PATH
+# currently serve (that may be the export under test)
+CLEANUP_REFERENCE = os.path.join(BASE_DIR, "cleanup", "model", "best.pt")
+PLANTING_REFERENCE = "yolov8n.pt"
+
+
+def load_images(folder):
+    paths = sorted(os.path.join(folder, f) for f in os.listdir(folder) if f.lower().endswith(IMAGE_EXTS))
+    return [img for img in (cv2.imread(p) for p in paths) if img is not None]
+
+
+def timed(fn, items):
+    fn(items[0])  # warm up
+    t0 = time.perf_counter()
+    out = [fn(x) for x in items]
+    return out, (time.perf_counter() - t0) * 1e3 / len(items)
+
+
+def iou(a, b):
+    ix = max(0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def match(ref, test, thr=0.5):
+    """Greedy same-label IoU matching; returns number of matched pairs"""
+    used = set()
+    matched = 0
+    for r in sorted(ref, key=lambda d: -d["conf"]):
+        best, best_iou = None, thr
+        for j, t in enumerate(test):
+            if j not in used and t["label"] == r["label"]:
+                score = iou(r["xyxy"], t["xyxy"])
+                if score >= best_iou:
+                    best, best_iou = j, score
+        if best is not None:
+            used.add(best)
+            matched += 1
+    return matched
+
+
+def check_cleanup(export_path, images):
+    from ultralytics import YOLO
+
+    ref_model = YOLO(CLEANUP_REFERENCE, task="classify")
+    test_model = YOLO(export_path, task="classify")
+    classify = lambda m: (lambda img: m.predict(img, verbose=False)[0].probs.data.cpu().numpy())
+    ref, ref_ms = timed(classify(ref_model), images)
+    test, test_ms = timed(classify(test_model), images)
+    agree = sum(int(r.argmax() == t.argmax()) for r, t in zip(ref, test)) / len(images)
+    max_diff = max(float(abs(r - t).max()) for r, t in zip(ref, test))
+    print(f"\ncleanup: {CLEANUP_REFERENCE} vs {export_path} on {len(images)} images")
+    print(f"  latency        {ref_ms:8.1f} ms -> {test_ms:8.1f} ms ({ref_ms / test_ms:.2f}x)")
+    print(f"  top-1 agree    {agree:8.2%}")
+    print(f"  max |dprob|    {max_diff:8.4f}")
+    return agree
+
+
+def check_planting(export_path, frames):
+    ref_det = Detector(PLANTING_REFERENCE)
+    test_det = Detector(export_path)
+    if ref_det.model is None or test_det.model is None:
+        print("planting: could not load both detectors (is ultralytics installed?)")
+        return 0.0
+    ref, ref_ms = timed(ref_det.detect, frames)
+    test, test_ms = timed(test_det.detect, frames)
+    n_ref = sum(len(d) for d in ref)
+    n_test = sum(len(d) for d in test)
+    matched = sum(match(r, t) for r, t in zip(ref, test))
+    evidence = [
+        (analyse_frame(img, r)[:2], analyse_frame(img, t)[:2]) for img, r, t in zip(frames, ref, test)
+    ]
+    agree = sum(int((a[0] is None) == (b[0] is None) and a[1] == b[1]) for a, b in evidence) / len(frames)
+    print(f"\nplanting: {PLANTING_REFERENCE} vs {export_path} on {len(frames)} frames")
+    print(f"  latency        {ref_ms:8.1f} ms -> {test_ms:8.1f} ms ({ref_ms / test_ms:.2f}x)")
+    print(f"  det recall     {matched / max(n_ref, 1):8.2%}  ({matched}/{n_ref})")
+    print(f"  det precision  {matched / max(n_test, 1):8.2%}  ({matched}/{n_test})")
+    print(f"  evidence agree {agree:8.2%}  (person present, plant found)")
+    return agree
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", required=True, help="folder of test images")
+    parser.add_argument("--cleanup", help="exported cleanup model")
+    parser.add_argument("--planting", help="exported planting detector")
+    parser.add_argument("--video", help="also take planting frames from this video")
+    parser.add_argument("--min-agreement", type=float, default=0.95)
+    args = parser.parse_args()
+
+    images = load_images(args.images)
+    if not images:
+        parser.error(f"no images in {args.images}")
+    rates = []
+    if args.cleanup:
+        rates.append(check_cleanup(args.cleanup, images))
+    if args.planting:
+        frames = images + (list(iter_frames(args.video, sample_fps=1, max_frames=60)) if args.video else [])
+        rates.append(check_planting(args.planting, frames))
+    if not rates:
+        parser.error("pass --cleanup and/or --planting")
+    sys.exit(0 if min(rates) >= args.min_agreement else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Stress test: concurrent /verify_planting requests through the Flask app.
+
+Every request uploads a different synthetic video under the same client
+filename, which used to make requests overwrite each other's files. Each
+video is first verified serially; the same uploads are then fired from
+many threads at once and every concurrent response must match its serial
+result. Finally it checks that no per-request scratch directories are left
+behind. The result cache is disabled so every request really runs.
+
+Usage:
+    python benchmarks/stress_planting_concurrency.py [--videos 6] [--threads 12] [--rounds 2]
+"""
+import argparse
+import glob
+import io
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+os.environ.setdefault("RESULT_CACHE_MAX_ENTRIES", "0")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import ml_service
+
+EVIDENCE_KEYS = ("num_frames", "person_frames", "plant_frames", "avg_motion", "reason")
+
+
+def synth_video(path, seed, seconds=6, fps=10, size=(320, 240)):
+    """Small clip whose green area and motion depend on the seed"""
+    rng = np.random.default_rng(seed)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+    base = cv2.resize(rng.integers(0, 255, (size[1] // 8, size[0] // 8, 3), dtype=np.uint8), size)
+    green = int(rng.integers(10, 80))
+    for i in range(seconds * fps):
+        frame = np.roll(base, i * int(rng.integers(1, 6)), axis=1)
+        cv2.rectangle(frame, (20, 20), (20 + green, 20 + green), (40, 200, 40), -1)
+        writer.write(frame)
+    writer.release()
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def post(client, data):
+    resp = client.post("/verify_planting", data={"video": (io.BytesIO(data), "video.mp4")},
+                       content_type="multipart/form-data")
+    body = resp.get_json()
+    summary = {k: body.get("evidence", {}).get(k) for k in EVIDENCE_KEYS} if resp.status_code == 200 else body
+    return resp.status_code, summary
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--videos", type=int, default=6)
+    parser.add_argument("--threads", type=int, default=12)
+    parser.add_argument("--rounds", type=int, default=2)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="stress_planting_")
+    videos = [synth_video(os.path.join(tmp, f"v{i}.mp4"), seed=i) for i in range(args.videos)]
+    scratch_before = set(glob.glob(os.path.join(tempfile.gettempdir(), "planting_*")))
+
+    client = ml_service.app.test_client()
+    print("Serial baseline...")
+    t0 = time.perf_counter()
+    expected = [post(client, v) for v in videos]
+    serial_s = time.perf_counter() - t0
+    for i, (status, summary) in enumerate(expected):
+        print(f"  video {i}: {status} {summary}")
+
+    jobs = [i for _ in range(args.rounds) for i in range(args.videos)]
+    print(f"\n{len(jobs)} concurrent requests on {args.threads} threads...")
+
+    def _run(i):
+        return i, post(ml_service.app.test_client(), videos[i])
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as ex:
+        results = list(ex.map(_run, jobs))
+    concurrent_s = time.perf_counter() - t0
+
+    mismatches = [(i, got) for i, got in results if got != expected[i]]
+    leftovers = set(glob.glob(os.path.join(tempfile.gettempdir(), "planting_*"))) - scratch_before
+
+    print(f"serial: {serial_s:.2f}s for {len(videos)} | concurrent: {concurrent_s:.2f}s for {len(jobs)}")
+    print(f"mismatched responses: {len(mismatches)}")
+    for i, got in mismatches[:5]:
+        print(f"  video {i}: expected {expected[i]}, got {got}")
+    print(f"leftover scratch dirs: {len(leftovers)}")
+
+    ml_service.planting_entry.get().shutdown()
+    sys.exit(1 if mismatches or leftovers else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,7 @@
 from flask import Flask, request, jsonify
-from pathlib import Path
-from utils import save_uploaded_file, verify_cleanup
+from utils import decode_image, get_audit_store, verify_cleanup
 app = Flask(__name__)
-# Folders
-BASE_DIR = Path(__file__).parent
-BEFORE_DIR = BASE_DIR / "uploads" / "before"
-AFTER_DIR  = BASE_DIR / "uploads" / "after"
+# Uploads are decoded in memory; set CLEANUP_AUDIT_DIR to also keep a size-capped copy
 @app.route("/verify_cleanup", methods=["POST"])
 def cleanup_check():
     """
@@ -25,20 +21,27 @@ def cleanup_check():
     # Validate threshold
     if not 0.0 <= confidence_threshold <= 1.0:
         return jsonify({"error": "confidence_threshold must be between 0.0 and 1.0"}), 400
-    # Save uploaded files
-    before_path = save_uploaded_file(before_file, BEFORE_DIR)
-    after_path  = save_uploaded_file(after_file, AFTER_DIR)
+    # Decode uploads straight from memory
+    before_data = before_file.read()
+    after_data = after_file.read()
+    try:
+        before_img = decode_image(before_data)
+        after_img = decode_image(after_data)
+    except ValueError:
+        return jsonify({"error": "Could not decode before/after image."}), 400
+    audit_store = get_audit_store()
+    audit_id = audit_store.save(before=before_data, after=after_data) if audit_store else None
     # Run verification with improved function
     result = verify_cleanup(
-        before_path, 
-        after_path, 
+        before_img, 
+        after_img, 
         confidence_threshold=confidence_threshold,
         log_details=True
     )
     
     # Award points only if cleanup is verified
     points = 10 if result['verified'] else 0
-    return jsonify({
+    response = {
         "cleanup_verified": result['verified'],
         "points_awarded": points,
         "reason": result['reason'],
@@ -60,6 +63,9 @@ def cleanup_check():
                 }
             }
         }
-    })
+    }
+    if audit_id:
+        response["audit_id"] = audit_id
+    return jsonify(response)
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
@@ -1,112 +1,98 @@
 import os
 import logging
+import threading
+import time
+import uuid
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of one process are serialised
+    fcntl = None
+from contextlib import contextmanager
+import cv2
+import numpy as np
 from ultralytics import YOLO
 from pathlib import Path
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
-# Load model once
-model_path = Path(__file__).parent / "model" / "best.pt"
-model = YOLO(model_path)
+# Model is loaded once per process, on first use. CLEANUP_MODEL_PATH can point
+# at an exported best.onnx / best.int8.onnx instead (see export_yolo.py)
+model_path = Path(os.environ.get("CLEANUP_MODEL_PATH") or Path(__file__).parent / "model" / "best.pt")
+_model = None
+_model_lock = threading.Lock()
+def get_model():
+    """Shared cleanup classifier for this process"""
+    global _model
+    with _model_lock:
+        if _model is None:
+            _model = YOLO(model_path, task="classify")
+    return _model
 # Class mapping
 cls_map = {0: "after", 1: "before"}
-def verify_cleanup(before_img_path, after_img_path, confidence_threshold=0.5, log_details=True):
+def _probs_result(probs):
+    return {
+        'class': cls_map[probs.top1],
+        'confidence': probs.top1conf.item(),
+        'probs': {
+            'after': probs.data[0].item(),
+            'before': probs.data[1].item()
+        }
+    }
+def classify_batch(images, batch_size=16):
     """
-    Verify cleanup with improved confidence threshold and detailed logging.
+    Classify many images, batch_size per forward pass.
     
     Args:
-        before_img_path: Path to the 'before' cleanup image
-        after_img_path: Path to the 'after' cleanup image
-        confidence_threshold: Minimum confidence required for verification (default: 0.5)
-        log_details: Whether to log detailed prediction information
+        images: image paths and/or BGR numpy arrays
+        batch_size: images per model.predict call
     
     Returns:
-        dict: {
-            'verified': bool,
-            'reason': str,
-            'before_class': str,
-            'before_confidence': float,
-            'after_class': str,
-            'after_confidence': float,
-            'before_probs': dict,
-            'after_probs': dict
-        }
+        list of {'class': str, 'confidence': float, 'probs': {'after': float, 'before': float}},
+        one per image, in input order
     """
-    # Predict both images
-    res_before = model.predict(before_img_path, verbose=False)[0].probs
-    res_after = model.predict(after_img_path, verbose=False)[0].probs
-    
-    # Get predictions and confidences
-    before_class = cls_map[res_before.top1]
-    before_conf = res_before.top1conf.item()
-    
-    after_class = cls_map[res_after.top1]
-    after_conf = res_after.top1conf.item()
-    
-    # Get full probability distributions
-    before_probs = {
-        'after': res_before.data[0].item(),
-        'before': res_before.data[1].item()
-    }
-    
-    after_probs = {
-        'after': res_after.data[0].item(),
-        'before': res_after.data[1].item()
-    }
+    model = get_model()
+    images = list(images)
+    batch_size = max(1, batch_size)
+    results = []
+    for i in range(0, len(images), batch_size):
+        chunk = images[i:i + batch_size]
+        for res in model.predict(chunk, batch=len(chunk), verbose=False):
+            results.append(_probs_result(res.probs))
+    return results
+def _verdict(before, after, confidence_threshold, log_details, before_name="before", after_name="after"):
+    """Cleanup decision from the classify_batch results of one before/after pair"""
+    before_class, before_conf, before_probs = before['class'], before['confidence'], before['probs']
+    after_class, after_conf, after_probs = after['class'], after['confidence'], after['probs']
     
     # Log details if requested
     if log_details:
-        logger.info(f"Before image: {before_img_path}")
+        logger.info(f"Before image: {before_name}")
         logger.info(f"  Predicted: {before_class} (confidence: {before_conf:.2%})")
         logger.info(f"  Probabilities - After: {before_probs['after']:.2%}, Before: {before_probs['before']:.2%}")
         
-        logger.info(f"After image: {after_img_path}")
+        logger.info(f"After image: {after_name}")
         logger.info(f"  Predicted: {after_class} (confidence: {after_conf:.2%})")
         logger.info(f"  Probabilities - After: {after_probs['after']:.2%}, Before: {after_probs['before']:.2%}")
     
     # Check confidence thresholds
     if before_conf < confidence_threshold:
         reason = f"Before image confidence too low ({before_conf:.2%} < {confidence_threshold:.2%})"
-        if log_details:
-            logger.warning(reason)
-        
-        return {
-            'verified': False,
-            'reason': reason,
-            'before_class': before_class,
-            'before_confidence': before_conf,
-            'after_class': after_class,
-            'after_confidence': after_conf,
-            'before_probs': before_probs,
-            'after_probs': after_probs
-        }
-    
-    if after_conf < confidence_threshold:
+        verified = False
+    elif after_conf < confidence_threshold:
         reason = f"After image confidence too low ({after_conf:.2%} < {confidence_threshold:.2%})"
-        if log_details:
-            logger.warning(reason)
-        
-        return {
-            'verified': False,
-            'reason': reason,
-            'before_class': before_class,
-            'before_confidence': before_conf,
-            'after_class': after_class,
-            'after_confidence': after_conf,
-            'before_probs': before_probs,
-            'after_probs': after_probs
-        }
-    
-    # Verify cleanup: before should be "before" and after should be "after"
-    verified = (before_class == "before" and after_class == "after")
+        verified = False
+    else:
+        # Verify cleanup: before should be "before" and after should be "after"
+        verified = (before_class == "before" and after_class == "after")
+        if verified:
+            reason = "Cleanup verified successfully"
+        else:
+            reason = f"Classification mismatch: before={before_class}, after={after_class}"
     
-    if verified:
-        reason = "Cleanup verified successfully"
-        if log_details:
+    if log_details:
+        if verified:
             logger.info(reason)
-    else:
-        reason = f"Classification mismatch: before={before_class}, after={after_class}"
-        if log_details:
+        else:
             logger.warning(reason)
     
     return {
@@ -119,9 +105,138 @@ def verify_cleanup(before_img_path, after_img_path, confidence_threshold=0.5, lo
         'before_probs': before_probs,
         'after_probs': after_probs
     }
-def save_uploaded_file(file, folder):
-    """Save uploaded image to folder, return saved path."""
-    os.makedirs(folder, exist_ok=True)
-    path = os.path.join(folder, file.filename)
-    file.save(path)
-    return path
\ No newline at end of file
+def verify_cleanup(before_img_path, after_img_path, confidence_threshold=0.5, log_details=True):
+    """
+    Verify cleanup with improved confidence threshold and detailed logging.
+    Both images are classified in a single forward pass.
+    
+    Args:
+        before_img_path: Path to (or BGR array of) the 'before' cleanup image
+        after_img_path: Path to (or BGR array of) the 'after' cleanup image
+        confidence_threshold: Minimum confidence required for verification (default: 0.5)
+        log_details: Whether to log detailed prediction information
+    
+    Returns:
+        dict: {
+            'verified': bool,
+            'reason': str,
+            'before_class': str,
+            'before_confidence': float,
+            'after_class': str,
+            'after_confidence': float,
+            'before_probs': dict,
+            'after_probs': dict
+        }
+    """
+    before, after = classify_batch([before_img_path, after_img_path], batch_size=2)
+    return _verdict(before, after, confidence_threshold, log_details,
+                    before_name=_describe(before_img_path), after_name=_describe(after_img_path))
+def verify_cleanup_batch(pairs, confidence_threshold=0.5, batch_size=32, log_details=False):
+    """
+    Verify many (before, after) pairs, e.g. for bulk re-verification.
+    All images go through classify_batch, batch_size images per forward pass.
+    Returns one verify_cleanup result dict per pair, in order.
+    """
+    pairs = list(pairs)
+    results = classify_batch([img for pair in pairs for img in pair], batch_size=batch_size)
+    return [
+        _verdict(results[2 * i], results[2 * i + 1], confidence_threshold, log_details,
+                 before_name=_describe(before), after_name=_describe(after))
+        for i, (before, after) in enumerate(pairs)
+    ]
+def _describe(img):
+    return img if isinstance(img, (str, Path)) else f"<array {getattr(img, 'shape', '?')}>"
+def decode_image(data):
+    """Decode uploaded image bytes to a BGR array, in memory. Raises ValueError if unreadable."""
+    img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR) if data else None
+    if img is None:
+        raise ValueError("Could not decode image")
+    return img
+def _image_ext(data):
+    if data[:3] == b"\xff\xd8\xff":
+        return ".jpg"
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return ".png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return ".webp"
+    return ".bin"
+class AuditStore:
+    """
+    Optional on-disk copy of verified uploads, for audits.
+    Every save gets a unique key (never the client filename) and the
+    directory is capped at max_bytes, oldest files evicted first. The cap is
+    enforced against the directory itself under a file lock, so several
+    server processes sharing root stay within max_bytes together.
+    """
+    LOCK_NAME = ".audit.lock"
+    def __init__(self, root, max_bytes=512 * 1024 * 1024):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.evictions = 0
+    @contextmanager
+    def _locked(self):
+        """Exclusive across this process's threads and, where fcntl exists, other processes"""
+        with self._lock, open(self.root / self.LOCK_NAME, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+    def _scan(self):
+        """Stored files as [(mtime_ns, name, path, size)], oldest first"""
+        files = []
+        for entry in os.scandir(self.root):
+            if not entry.is_file() or entry.name == self.LOCK_NAME or entry.name.endswith(".tmp"):
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((st.st_mtime_ns, entry.name, Path(entry.path), st.st_size))
+        files.sort()
+        return files
+    def save(self, **images):
+        """Store images given as name=bytes under one new key, e.g. save(before=..., after=...)"""
+        key = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:12]}"
+        with self._locked():
+            for name, data in images.items():
+                path = self.root / f"{key}_{name}{_image_ext(data)}"
+                tmp = path.with_suffix(path.suffix + ".tmp")
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            files = self._scan()
+            total = sum(size for *_, size in files)
+            for _, _, old, size in files:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    old.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self.evictions += 1
+        return key
+    def stats(self):
+        with self._locked():
+            files = self._scan()
+        return {"root": str(self.root), "files": len(files), "bytes": sum(size for *_, size in files),
+                "max_bytes": self.max_bytes, "evictions": self.evictions}
+# Audit store is off unless CLEANUP_AUDIT_DIR is set
+_audit_store = None
+_audit_lock = threading.Lock()
+def get_audit_store():
+    """Shared AuditStore configured by CLEANUP_AUDIT_DIR / CLEANUP_AUDIT_MAX_MB, or None"""
+    global _audit_store
+    root = os.environ.get("CLEANUP_AUDIT_DIR")
+    if not root:
+        return None
+    with _audit_lock:
+        if _audit_store is None:
+            max_mb = float(os.environ.get("CLEANUP_AUDIT_MAX_MB", 512))
+            _audit_store = AuditStore(root, max_bytes=int(max_mb * 1024 * 1024))
+    return _audit_store
@@ -0,0 +1,153 @@
+"""
+Export the YOLO models to a CPU-optimised runtime.
+
+  - cleanup classifier: cleanup/model/best.pt   -> best.onnx [, best.int8.onnx]
+  - planting detector:  yolov8n.pt              -> yolov8n.onnx [, yolov8n.int8.onnx]
+
+ONNX files are exported with a dynamic batch axis so detect_batch /
+classify_batch keep batching. With --int8 a statically quantized copy is
+written as well, calibrated on --calib-dir images (use real cleanup photos
+and planting frames; a few dozen to a few hundred are enough).
+--format openvino exports an OpenVINO IR directory instead (fp32 only).
+
+Exported models are served by pointing the services at them, e.g.
+    CLEANUP_MODEL_PATH=cleanup/model/best.int8.onnx
+    PLANTING_MODEL_PATH=yolov8n.int8.onnx
+Ultralytics then runs them through onnxruntime / OpenVINO behind the same
+Detector.detect and verify_cleanup interfaces. Check accuracy first with
+benchmarks/check_export_parity.py.
+
+Requires: ultralytics, onnx, onnxruntime (see requirements-export.txt).
+
+Usage:
+    python export_yolo.py [--models cleanup planting] [--int8 --calib-dir imgs/] [--format onnx|openvino]
+"""
+import argparse
+import os
+import sys
+
+import cv2
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS = {
+    "cleanup": (os.path.join(BASE_DIR, "cleanup", "model", "best.pt"), "classify"),
+    "planting": ("yolov8n.pt", "detect"),
+}
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+
+def preprocess(img, imgsz, task):
+    """BGR image -> 1x3xHxW float32 input, as ultralytics feeds the model"""
+    if task == "classify":
+        # resize the short side, then center crop
+        h, w = img.shape[:2]
+        scale = imgsz / min(h, w)
+        img = cv2.resize(img, (max(imgsz, round(w * scale)), max(imgsz, round(h * scale))),
+                         interpolation=cv2.INTER_LINEAR)
+        h, w = img.shape[:2]
+        top, left = (h - imgsz) // 2, (w - imgsz) // 2
+        img = img[top:top + imgsz, left:left + imgsz]
+    else:
+        # letterbox to imgsz x imgsz with grey padding
+        h, w = img.shape[:2]
+        scale = min(imgsz / h, imgsz / w)
+        nh, nw = round(h * scale), round(w * scale)
+        resized = cv2.resize(img, (nw, nh), interpolation=cv2.INTER_LINEAR)
+        img = np.full((imgsz, imgsz, 3), 114, dtype=np.uint8)
+        top, left = (imgsz - nh) // 2, (imgsz - nw) // 2
+        img[top:top + nh, left:left + nw] = resized
+    x = img[:, :, ::-1].transpose(2, 0, 1).astype(np.float32) / 255.0
+    return np.ascontiguousarray(x[None])
+
+
+def calibration_images(calib_dir, limit):
+    paths = sorted(
+        os.path.join(calib_dir, f) for f in os.listdir(calib_dir) if f.lower().endswith(IMAGE_EXTS)
+    )[:limit]
+    if not paths:
+        raise ValueError(f"No calibration images in {calib_dir}")
+    return paths
+
+
+def quantize_int8(onnx_path, task, imgsz, calib_dir, limit=200):
+    """Static INT8 (QDQ) quantization of onnx_path with onnxruntime; returns the new path"""
+    import onnxruntime as ort
+    from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+
+    input_name = ort.InferenceSession(onnx_path, providers=["CPUExecutionProvider"]).get_inputs()[0].name
+    paths = calibration_images(calib_dir, limit)
+
+    class _Reader(CalibrationDataReader):
+        def __init__(self):
+            self._paths = iter(paths)
+
+        def get_next(self):
+            for path in self._paths:
+                img = cv2.imread(path)
+                if img is not None:
+                    return {input_name: preprocess(img, imgsz, task)}
+            return None
+
+    out_path = onnx_path[:-len(".onnx")] + ".int8.onnx"
+    quantize_static(
+        onnx_path, out_path, _Reader(),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+    )
+    print(f"   INT8 model: {out_path} (calibrated on {len(paths)} images)")
+    return out_path
+
+
+def export_model(name, fmt="onnx", int8=False, calib_dir=None, calib_limit=200):
+    from ultralytics import YOLO
+
+    weights, task = MODELS[name]
+    model = YOLO(weights, task=task)
+    imgsz = int(model.overrides.get("imgsz") or (224 if task == "classify" else 640))
+    print(f"🔄 Exporting {name} ({weights}, {task}, imgsz={imgsz}) to {fmt}...")
+    if fmt == "onnx":
+        path = model.export(format="onnx", imgsz=imgsz, dynamic=True, simplify=True)
+    else:
+        path = model.export(format="openvino", imgsz=imgsz)
+    path = str(path)
+    print(f"✅ {name}: {path}")
+    if int8:
+        if fmt != "onnx":
+            print("   --int8 is only supported for onnx, skipping")
+        else:
+            path = quantize_int8(path, task, imgsz, calib_dir, limit=calib_limit)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", nargs="+", choices=sorted(MODELS), default=sorted(MODELS))
+    parser.add_argument("--format", choices=("onnx", "openvino"), default="onnx")
+    parser.add_argument("--int8", action="store_true", help="also write a statically quantized INT8 model")
+    parser.add_argument("--calib-dir", help="calibration images for --int8")
+    parser.add_argument("--calib-limit", type=int, default=200)
+    args = parser.parse_args()
+    if args.int8 and not args.calib_dir:
+        parser.error("--int8 needs --calib-dir")
+
+    env = {"cleanup": "CLEANUP_MODEL_PATH", "planting": "PLANTING_MODEL_PATH"}
+    exported = {}
+    failed = False
+    for name in args.models:
+        try:
+            exported[name] = export_model(name, args.format, args.int8, args.calib_dir, args.calib_limit)
+        except Exception as e:
+            print(f"❌ Export of {name} failed: {e}")
+            failed = True
+    if exported:
+        print("\nServe the exported models with:")
+        for name, path in exported.items():
+            print(f"  {env[name]}={path}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""
+gunicorn settings for the ML service:
+
+    gunicorn -c gunicorn.conf.py ml_service:app
+
+Threaded (gthread) workers are required: /verify_planting waits on its
+planting pool job, and with sync workers that wait would block the whole
+worker process. Each worker runs its own planting pool; ml_service sizes it
+to half the cores divided by WEB_CONCURRENCY (or PLANTING_WORKERS each).
+"""
+import os
+
+bind = os.environ.get("BIND", f"0.0.0.0:{os.environ.get('PORT', 5000)}")
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+# long enough for a planting job to hit its own PLANTING_TIMEOUT_S first
+timeout = int(float(os.environ.get("PLANTING_TIMEOUT_S", 300))) + 60
+
+# the app reads this to split the planting cores across workers
+os.environ["WEB_CONCURRENCY"] = str(workers)
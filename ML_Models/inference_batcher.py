@@ -0,0 +1,138 @@
+"""
+Dynamic micro-batching for model inference.
+
+Concurrent requests submit single preprocessed inputs; a worker thread
+gathers them into a batch (up to max_batch_size, or whatever arrived within
+max_wait_ms of the oldest queued input), runs one forward pass and hands each
+row of the output back to its caller.
+"""
+import collections
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+METRICS_WINDOW = 1000  # recent batches kept for percentile metrics
+
+
+class _Request:
+    __slots__ = ("item", "future", "enqueued_at")
+
+    def __init__(self, item):
+        self.item = item
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatcher:
+    """
+    predict_fn takes a stacked batch of shape (n, ...) and returns an array
+    whose first dimension is n.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=8, max_wait_ms=5.0, name="batcher"):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        self.predict_fn = predict_fn
+        self.max_batch_size = int(max_batch_size)
+        self.max_wait_s = max(0.0, float(max_wait_ms)) / 1000.0
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+        self._metrics_lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._errors = 0
+        self._batch_sizes = collections.Counter()
+        self._recent_waits_ms = collections.deque(maxlen=METRICS_WINDOW)
+        self._recent_infer_ms = collections.deque(maxlen=METRICS_WINDOW)
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def submit(self, item):
+        """Queue one input; returns a Future resolving to its output row"""
+        self._ensure_started()
+        req = _Request(item)
+        self._queue.put(req)
+        return req.future
+
+    def predict(self, item, timeout=None):
+        """Blocking convenience wrapper around submit()"""
+        return self.submit(item).result(timeout=timeout)
+
+    def _collect(self):
+        first = self._queue.get()
+        batch = [first]
+        deadline = first.enqueued_at + self.max_wait_s
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            waits = [(started - r.enqueued_at) * 1000.0 for r in batch]
+            try:
+                outputs = self.predict_fn(np.stack([r.item for r in batch]))
+                if len(outputs) != len(batch):
+                    raise RuntimeError(f"predict_fn returned {len(outputs)} rows for a batch of {len(batch)}")
+            except Exception as e:
+                for r in batch:
+                    r.future.set_exception(e)
+                failed = True
+            else:
+                for r, out in zip(batch, outputs):
+                    r.future.set_result(out)
+                failed = False
+            infer_ms = (time.perf_counter() - started) * 1000.0
+
+            with self._metrics_lock:
+                self._batches += 1
+                self._items += len(batch)
+                self._errors += int(failed)
+                self._batch_sizes[len(batch)] += 1
+                self._recent_waits_ms.extend(waits)
+                self._recent_infer_ms.append(infer_ms)
+
+    def metrics(self):
+        with self._metrics_lock:
+            waits = np.array(self._recent_waits_ms) if self._recent_waits_ms else np.zeros(1)
+            infer = np.array(self._recent_infer_ms) if self._recent_infer_ms else np.zeros(1)
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_s * 1000.0,
+                "queue_depth": self._queue.qsize(),
+                "batches": self._batches,
+                "items": self._items,
+                "errors": self._errors,
+                "mean_batch_size": self._items / self._batches if self._batches else 0.0,
+                "batch_size_histogram": {str(k): v for k, v in sorted(self._batch_sizes.items())},
+                "queue_wait_ms": {
+                    "mean": float(waits.mean()),
+                    "p50": float(np.percentile(waits, 50)),
+                    "p95": float(np.percentile(waits, 95)),
+                    "max": float(waits.max()),
+                },
+                "inference_ms": {
+                    "mean": float(infer.mean()),
+                    "p95": float(np.percentile(infer, 95)),
+                },
+            }
@@ -1,53 +1,124 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-from math import radians, sin, cos, sqrt, atan2
 import sys
 import os
-import tensorflow as tf
+import multiprocessing
 import numpy as np
-from tensorflow.keras.preprocessing import image
-from tensorflow.keras.applications.mobilenet_v2 import preprocess_input
-from werkzeug.utils import secure_filename
-import tempfile
-import cv2
+
+from model_registry import registry, estimate_nbytes
+from inference_batcher import MicroBatcher
+from result_cache import ResultCache, hash_stream, model_version
 
 app = Flask(__name__)
 # Allow requests from Node.js backend or Frontend
 allowed_origins = os.environ.get("FRONTEND_URL", "*") 
 CORS(app, resources={r"/*": {"origins": allowed_origins}})
 
+# Shared result cache for the image/video verification endpoints
+result_cache = ResultCache(
+    max_entries=int(os.environ.get("RESULT_CACHE_MAX_ENTRIES", 1024)),
+    max_bytes=int(float(os.environ.get("RESULT_CACHE_MAX_MB", 64)) * 1024 * 1024),
+    ttl_s=float(os.environ.get("RESULT_CACHE_TTL_S", 3600))
+)
+
 # ============== WALK VERIFICATION ==============
-def haversine(lat1, lon1, lat2, lon2):
-    """Calculate distance between two GPS points"""
-    R = 6371  # Earth radius in km
-    dlat = radians(lat2 - lat1)
-    dlon = radians(lon2 - lon1)
-    a = sin(dlat / 2)**2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
-    return R * c  # Distance in km
+
+# Add walk module to path
+WALK_PATH = os.path.join(os.path.dirname(__file__), "Walk")
+sys.path.insert(0, WALK_PATH)
+
+from track_engine import (
+    evaluate_track, track_from_request, simplify_options_from_request,
+    verify_batch, WALK_THRESHOLD_KM
+)
+from walk_sessions import WalkSessionStore, DEFAULT_DB_PATH, MAX_SESSIONS_PER_CLIENT
+
+# SQLite file shared by every worker process on this host (see walk_sessions)
+walk_sessions = WalkSessionStore(
+    path=os.environ.get("WALK_SESSIONS_DB") or DEFAULT_DB_PATH,
+    max_per_client=int(os.environ.get("WALK_SESSIONS_PER_CLIENT", MAX_SESSIONS_PER_CLIENT))
+)
 
 @app.route('/verify_walk', methods=['POST'])
 def verify_walk():
     """Existing walk verification endpoint"""
-    data = request.get_json()
-    coords = data.get("coordinates", [])  # list of {lat, lon}
+    try:
+        lat, lon = track_from_request(request)  # JSON coordinates, polyline or packed floats
+        simplify = simplify_options_from_request(request)
+        result = evaluate_track(lat, lon, threshold_km=WALK_THRESHOLD_KM, simplify=simplify)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    if not coords or len(coords) < 2:
-        return jsonify({"error": "Not enough coordinates"}), 400
+    return jsonify(result)
 
-    total_distance = 0.0
-    for i in range(len(coords) - 1):
-        lat1, lon1 = coords[i]["lat"], coords[i]["lon"]
-        lat2, lon2 = coords[i+1]["lat"], coords[i+1]["lon"]
-        total_distance += haversine(lat1, lon1, lat2, lon2)
 
-    threshold = 2.0  # km
-    result = total_distance >= threshold
+@app.route('/verify_walk/batch', methods=['POST'])
+def verify_walk_batch():
+    """
+    Verify many walks in one request
+    Expects: {"tracks": [[{lat, lon}, ...] or {"coordinates": [...]} or {"polyline": "..."}, ...]}
+    Returns per-track results in input order; bad tracks carry an "error" in place
+    """
+    data = request.get_json(silent=True) or {}
+    tracks = data.get("tracks")
+
+    if not isinstance(tracks, list) or not tracks:
+        return jsonify({"error": "No tracks provided"}), 400
+
+    results = verify_batch(tracks, threshold_km=WALK_THRESHOLD_KM)
+    return jsonify({"results": results})
 
-    return jsonify({
-        "total_distance_km": round(total_distance, 2),
-        "walk_valid": result
-    })
+
+@app.route('/walk_sessions', methods=['POST'])
+def open_walk_session():
+    """
+    Open an incremental walk session
+    Requires X-Client-Id: the end user's id, set by the Node backend after it
+    has authenticated the user. The per-client session limit is keyed on it,
+    so this service must only be reachable through the backend.
+    """
+    client_id = (request.headers.get("X-Client-Id") or "").strip()
+    if not client_id:
+        return jsonify({"error": "X-Client-Id header required"}), 400
+    try:
+        session = walk_sessions.open(threshold_km=WALK_THRESHOLD_KM, client_id=client_id)
+    except RuntimeError as e:
+        return jsonify({"error": str(e)}), 429
+    return jsonify(session.summary()), 201
+
+
+@app.route('/walk_sessions/<session_id>/points', methods=['POST'])
+def append_walk_points(session_id):
+    """Append a chunk of GPS fixes and return the running total"""
+    try:
+        lat, lon = track_from_request(request)
+        session = walk_sessions.append(session_id, lat, lon)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if session is None:
+        return jsonify({"error": "Unknown walk session"}), 404
+
+    return jsonify(session.summary())
+
+
+@app.route('/walk_sessions/<session_id>', methods=['GET'])
+def get_walk_session(session_id):
+    """Running total of an open walk session"""
+    session = walk_sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": "Unknown walk session"}), 404
+    return jsonify(session.summary())
+
+
+@app.route('/walk_sessions/<session_id>/finish', methods=['POST'])
+def finish_walk_session(session_id):
+    """Close a walk session and return the final verdict"""
+    session = walk_sessions.close(session_id)
+    if session is None:
+        return jsonify({"error": "Unknown walk session"}), 404
+    if session.num_points < 2:
+        return jsonify({"error": "Not enough coordinates", **session.summary()}), 400
+    return jsonify(session.summary())
 
 
 # ============== PUBLIC TRANSPORT VERIFICATION ==============
@@ -68,64 +139,125 @@ CLASS_NAMES = [
     "not_transport"
 ]
 
-# Load model once at startup
-print("🔄 Loading Public Transport model...")
-try:
-    # Try loading as Keras model
-    pt_model = tf.keras.models.load_model(MODEL_PATH)
-    print("✅ Public Transport model loaded successfully")
-except ValueError:
-    # Load as SavedModel with TFSMLayer (for Keras 3)
-    print("Loading SavedModel with TFSMLayer...")
-    tfsm_layer = tf.keras.layers.TFSMLayer(MODEL_PATH, call_endpoint='serving_default')
-    inputs = tf.keras.Input(shape=(224, 224, 3))
-    outputs = tfsm_layer(inputs)
-    
-    if isinstance(outputs, dict):
-        outputs = list(outputs.values())[0]
-    
-    pt_model = tf.keras.Model(inputs=inputs, outputs=outputs)
-    print("✅ Public Transport model loaded (SavedModel)")
-except Exception as e:
-    print(f"❌ Error loading model: {e}")
-    pt_model = None
+def _load_pt_backends():
+    """PublicTransport/backends.py (numpy + PIL only; TensorFlow is imported lazily)"""
+    import importlib.util
+    path = os.path.join(os.path.dirname(__file__), "PublicTransport", "backends.py")
+    spec = importlib.util.spec_from_file_location("pt_backends", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
 
 
-def predict_transport_image(img_path):
-    """Predict transport class from image"""
-    if pt_model is None:
-        raise RuntimeError("Model not loaded")
-    
-    # Load and preprocess image
-    img = image.load_img(img_path, target_size=IMG_SIZE)
-    img_array = image.img_to_array(img)
-    img_array = preprocess_input(img_array)  # MobileNetV2 preprocessing
-    img_array = np.expand_dims(img_array, axis=0)
-    
-    # Predict
-    predictions = pt_model.predict(img_array, verbose=0)
-    predicted_index = np.argmax(predictions)
-    confidence = float(np.max(predictions))
+pt_backends = _load_pt_backends()
+# savedmodel (default) | tflite_fp16 | tflite_int8 (convert with PublicTransport/convert_tflite.py)
+PT_BACKEND = os.environ.get("PT_BACKEND", "savedmodel")
+PT_TFLITE_THREADS = int(os.environ.get("PT_TFLITE_THREADS", 0)) or None
+
+PT_CONFIDENCE_THRESHOLD = 0.6
+_pt_model_version = None
+
+
+def pt_model_version():
+    """
+    Cache version tag of the configured backend. Resolved on first use, after
+    the model loaded, so a bad PT_BACKEND only fails the public transport routes
+    """
+    global _pt_model_version
+    if _pt_model_version is None:
+        _pt_model_version = model_version(pt_backends.backend_path(PT_BACKEND))
+    return _pt_model_version
+
+def _load_public_transport_model():
+    """Load the configured backend: TFLite interpreter, or TensorFlow + SavedModel (runs on first use)"""
+    if PT_BACKEND != "savedmodel":
+        # one interpreter per power-of-two batch size up to the micro-batcher's limit
+        return pt_backends.load_tflite(PT_BACKEND, num_threads=PT_TFLITE_THREADS, max_batch_size=PT_MAX_BATCH_SIZE)
+
+    import tensorflow as tf
+
+    try:
+        # Try loading as Keras model
+        model = tf.keras.models.load_model(MODEL_PATH)
+    except ValueError:
+        # Load as SavedModel with TFSMLayer (for Keras 3)
+        print("Loading SavedModel with TFSMLayer...")
+        tfsm_layer = tf.keras.layers.TFSMLayer(MODEL_PATH, call_endpoint='serving_default')
+        inputs = tf.keras.Input(shape=(224, 224, 3))
+        outputs = tfsm_layer(inputs)
+
+        if isinstance(outputs, dict):
+            outputs = list(outputs.values())[0]
+
+        model = tf.keras.Model(inputs=inputs, outputs=outputs)
+
+    # fixed [None, 224, 224, 3] tf.function, traced and warmed up here instead
+    # of paying Keras predict() overhead on every batch
+    return pt_backends.compile_model(model)
+
+
+pt_model_entry = registry.register("public_transport", _load_public_transport_model)
+
+# Concurrent /verify_public_transport requests are gathered into one forward pass
+PT_MAX_BATCH_SIZE = int(os.environ.get("PT_MAX_BATCH_SIZE", 8))
+PT_MAX_WAIT_MS = float(os.environ.get("PT_MAX_WAIT_MS", 10))
+
+
+def _predict_transport_batch(batch):
+    return pt_model_entry.get().predict(batch, verbose=0)
+
+
+pt_batcher = MicroBatcher(
+    _predict_transport_batch,
+    max_batch_size=PT_MAX_BATCH_SIZE,
+    max_wait_ms=PT_MAX_WAIT_MS,
+    name="public-transport-batcher"
+)
+
+
+def preprocess_transport_bytes(data):
+    """Decode encoded image bytes straight into a preprocessed (224, 224, 3) array"""
+    # same as keras load_img + mobilenet_v2.preprocess_input, without TensorFlow
+    return pt_backends.preprocess(data, img_size=IMG_SIZE)
+
+
+def predict_transport_bytes(data):
+    """Predict transport class from encoded image bytes (no filesystem access)"""
+    pt_model_entry.get()
+    img_array = preprocess_transport_bytes(data)
+
+    # Predict (batched with other in-flight requests)
+    probs = pt_batcher.predict(img_array)
+    predicted_index = np.argmax(probs)
+    confidence = float(np.max(probs))
     
     return {
         "predicted_class": CLASS_NAMES[predicted_index],
         "confidence": confidence,
         "all_probabilities": {
-            CLASS_NAMES[i]: float(predictions[0][i])
+            CLASS_NAMES[i]: float(probs[i])
             for i in range(len(CLASS_NAMES))
         }
     }
 
 
+def predict_transport_image(img_path):
+    """Predict transport class from an image file (thin wrapper for CLI use)"""
+    with open(img_path, "rb") as f:
+        return predict_transport_bytes(f.read())
+
+
 @app.route('/verify_public_transport', methods=['POST'])
 def verify_public_transport():
     """
     Verify public transport activity via image classification
     Expects: image file via multipart/form-data OR image URL
     """
-    if pt_model is None:
+    try:
+        pt_model_entry.get()
+    except RuntimeError:
         return jsonify({"error": "Model not loaded"}), 500
-    
+
     try:
         # Check if image file is provided
         if 'image' not in request.files:
@@ -141,17 +273,21 @@ def verify_public_transport():
         if file.filename == '':
             return jsonify({"error": "No file selected"}), 400
         
-        # Save to temporary file
-        temp_dir = tempfile.gettempdir()
-        filename = secure_filename(file.filename)
-        temp_path = os.path.join(temp_dir, filename)
-        file.save(temp_path)
-        
+        # Decode straight from the upload stream, nothing touches disk
+        data = file.read()
+        if not data:
+            return jsonify({"error": "Empty file"}), 400
+
+        cache_key = result_cache.make_key(
+            "public_transport", pt_model_version(),
+            {"confidence_threshold": PT_CONFIDENCE_THRESHOLD}, data
+        )
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            return jsonify({**cached, "cached": True})
+
         # Run prediction
-        result = predict_transport_image(temp_path)
-        
-        # Clean up
-        os.remove(temp_path)
+        result = predict_transport_bytes(data)
         
         # Add validation flag
         predicted_class = result['predicted_class']
@@ -160,10 +296,11 @@ def verify_public_transport():
         # Determine if valid
         is_valid_transport = predicted_class in ['auto_rickshaw', 'bus', 'metro']
         
-        result['is_valid'] = is_valid_transport and confidence >= 0.6
-        result['should_review'] = confidence < 0.6 or not is_valid_transport
+        result['is_valid'] = is_valid_transport and confidence >= PT_CONFIDENCE_THRESHOLD
+        result['should_review'] = confidence < PT_CONFIDENCE_THRESHOLD or not is_valid_transport
         
-        return jsonify(result)
+        result_cache.put(cache_key, result)
+        return jsonify({**result, "cached": False})
     
     except Exception as e:
         print(f"❌ Prediction error: {e}")
@@ -175,37 +312,97 @@ def verify_public_transport():
 # Add planting module to path
 PLANTING_PATH = os.path.join(os.path.dirname(__file__), "planting")
 sys.path.insert(0, PLANTING_PATH)
+from utils.cleanup import request_workspace, upload_path
+from planting_pool import PlantingTimeout, PlantingWorkerError
+
+# Planting jobs run in a bounded process pool, one per server process; run under
+# gunicorn.conf.py (gthread workers) so a request waiting on a job doesn't block
+# the others. Default size: half the cores split across WEB_CONCURRENCY processes
+PLANTING_WORKERS = int(os.environ.get("PLANTING_WORKERS", 0)) or None
+PLANTING_TIMEOUT_S = float(os.environ.get("PLANTING_TIMEOUT_S", 300))
+# Optional debug sink: also dump each request's sampled frames here as JPEG
+PLANTING_DEBUG_FRAMES_DIR = os.environ.get("PLANTING_DEBUG_FRAMES_DIR") or None
+# yolov8n.pt (PyTorch) or an export such as yolov8n.int8.onnx (see export_yolo.py)
+PLANTING_MODEL_PATH = os.environ.get("PLANTING_MODEL_PATH", "yolov8n.pt")
+# Unset: the motion backend's calibrated default; required for backends without one (diff)
+PLANTING_MOTION_THRESHOLD = os.environ.get("PLANTING_MOTION_THRESHOLD")
+
+
+def _load_planting():
+    """Start the planting worker pool; workers preload the YOLO detector"""
+    from planting_pool import PlantingPool
+    from video_processing.motion import default_threshold
+    if PLANTING_PARAMS["motion_threshold"] is None:
+        # fails the planting model (see /health) for backends without a default
+        PLANTING_PARAMS["motion_threshold"] = default_threshold(PLANTING_PARAMS["motion_backend"])
+    pool = PlantingPool(max_workers=PLANTING_WORKERS, model_path=PLANTING_MODEL_PATH)
+    pool.warmup(wait=True)  # surfaces worker import/initializer failures here
+    return pool
+
+
+def _planting_pool_nbytes(pool):
+    """Detector weights summed over the pool's worker processes"""
+    return sum(d["param_bytes"] for dets in pool.workers.values() for d in dets)
 
-# Import planting verification functions
-try:
-    from video_processing.extract_frames import extract_frames
-    from video_processing.verify_video import verify_planting_from_frames
-    from utils.cleanup import ensure_empty_dir
-    print("✅ Planting model modules loaded successfully")
-    planting_available = True
-except Exception as e:
-    print(f"❌ Error loading planting modules: {e}")
-    planting_available = False
+
+planting_entry = registry.register("planting", _load_planting, sizer=_planting_pool_nbytes)
+
+PLANTING_PARAMS = {
+    "sample_fps": 1,
+    "max_frames": int(os.environ.get("PLANTING_MAX_FRAMES", 60)),
+    "min_plant_frames": 1,
+    "motion_threshold": float(PLANTING_MOTION_THRESHOLD) if PLANTING_MOTION_THRESHOLD else None,
+    # grab (exact, skips BGR conversion of dropped frames) | seek | read
+    "sampling_mode": os.environ.get("PLANTING_SAMPLING_MODE", "grab"),
+    # uniform (sample_fps) | keyframes (scene changes, max_frames is the budget)
+    "sampler": os.environ.get("PLANTING_SAMPLER", "uniform"),
+    "batch_size": int(os.environ.get("PLANTING_BATCH_SIZE", 8)),
+    # opt-in: stop decoding/inference once the pass criteria hold with this margin
+    # to spare. Changes verdicts: motion is then averaged over the frames seen so
+    # far, so a video whose full-length average is below threshold can pass
+    "early_exit": os.environ.get("PLANTING_EARLY_EXIT", "0") == "1",
+    "early_exit_margin": float(os.environ.get("PLANTING_EARLY_EXIT_MARGIN", 0.25)),
+    # farneback | dis | diff (diff needs PLANTING_MOTION_THRESHOLD)
+    "motion_backend": os.environ.get("PLANTING_MOTION_BACKEND", "farneback"),
+    "motion_options": {
+        # flow on the person ROI plus a margin instead of the whole frame
+        "roi_only": os.environ.get("PLANTING_MOTION_ROI_ONLY", "1") != "0",
+        "downscale": float(os.environ.get("PLANTING_MOTION_DOWNSCALE", 1.0))
+    },
+    # threads per job for detection; keep PLANTING_WORKERS x this <= cores
+    "frame_workers": int(os.environ.get("PLANTING_FRAME_WORKERS", 1))
+}
+PLANTING_MODEL_VERSION = model_version(PLANTING_MODEL_PATH)
 
 
 # ============== CLEANUP VERIFICATION ==============
 
-# Import cleanup verification function
-try:
+def _load_cleanup():
+    """Import cleanup/utils.py and load its YOLO classifier"""
     import importlib.util
     cleanup_utils_file = os.path.join(os.path.dirname(__file__), "cleanup", "utils.py")
     spec = importlib.util.spec_from_file_location("cleanup_utils", cleanup_utils_file)
     cleanup_utils = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(cleanup_utils)
-    cleanup_verify_func = cleanup_utils.verify_cleanup
-    
-    print("✅ Cleanup model loaded successfully")
-    cleanup_available = True
-except Exception as e:
-    print(f"❌ Error loading cleanup model: {e}")
-    import traceback
-    traceback.print_exc()
-    cleanup_available = False
+    cleanup_utils.get_model()
+    return cleanup_utils
+
+
+cleanup_entry = registry.register(
+    "cleanup", _load_cleanup, sizer=lambda m: estimate_nbytes(m.get_model())
+)
+
+CLEANUP_CONFIDENCE_THRESHOLD = 0.5
+CLEANUP_MODEL_VERSION = model_version(
+    os.environ.get("CLEANUP_MODEL_PATH")
+    or os.path.join(os.path.dirname(__file__), "cleanup", "model", "best.pt")
+)
+
+# ML_WARMUP=all (or a comma-separated list of model names) loads models on a
+# background thread at startup instead of on the first request
+_warmup = os.environ.get("ML_WARMUP", "").strip()
+if _warmup and multiprocessing.parent_process() is None:
+    registry.warmup(None if _warmup == "all" else [n.strip() for n in _warmup.split(",")])
 
 
 @app.route('/verify_planting', methods=['POST'])
@@ -214,9 +411,11 @@ def verify_planting():
     Verify tree planting activity via video analysis
     Expects: video file via multipart/form-data
     """
-    if not planting_available:
+    try:
+        planting_pool = planting_entry.get()
+    except RuntimeError:
         return jsonify({"error": "Planting model not available"}), 500
-    
+
     try:
         # Check if video file is provided
         if 'video' not in request.files:
@@ -227,44 +426,38 @@ def verify_planting():
         if file.filename == '':
             return jsonify({"error": "No file selected"}), 400
         
-        # Save to temporary file
-        temp_dir = tempfile.gettempdir()
-        filename = secure_filename(file.filename)
-        temp_video_path = os.path.join(temp_dir, filename)
-        file.save(temp_video_path)
-        
-        # Create temp directory for frames
-        temp_frames_dir = os.path.join(temp_dir, "planting_frames")
-        ensure_empty_dir(temp_frames_dir)
-        
-        # Extract frames from video
-        frames = extract_frames(
-            temp_video_path, 
-            out_dir=temp_frames_dir, 
-            sample_fps=1, 
-            max_frames=60
+        # Hash the upload stream first so a cache hit never touches disk
+        cache_key = result_cache.make_key(
+            "planting", PLANTING_MODEL_VERSION, PLANTING_PARAMS, hash_stream(file.stream)
         )
-        
-        if not frames:
-            # Clean up
-            os.remove(temp_video_path)
-            ensure_empty_dir(temp_frames_dir)
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            return jsonify({**cached, "cached": True})
+
+        # Each request gets its own scratch directory, removed even on failure
+        with request_workspace(prefix="planting_") as workspace:
+            temp_video_path = upload_path(workspace, file.filename)
+            file.save(temp_video_path)
+
+            # Stream frames into verification in a worker process
+            try:
+                num_frames, passed, evidence = planting_pool.run(
+                    temp_video_path,
+                    timeout=PLANTING_TIMEOUT_S,
+                    debug_dir=PLANTING_DEBUG_FRAMES_DIR,
+                    **PLANTING_PARAMS
+                )
+            except PlantingTimeout as e:
+                return jsonify({"error": str(e)}), 504
+            except PlantingWorkerError as e:
+                return jsonify({"error": str(e)}), 503
+
+        if not num_frames:
             return jsonify({
                 "error": "No frames extracted from video",
                 "is_valid": False
             }), 400
-        
-        # Run planting verification
-        passed, evidence = verify_planting_from_frames(
-            temp_frames_dir,
-            min_plant_frames=1,
-            motion_threshold=0.6
-        )
-        
-        # Clean up
-        os.remove(temp_video_path)
-        ensure_empty_dir(temp_frames_dir)
-        
+
         # Calculate confidence based on evidence
         confidence = 0.0
         if passed:
@@ -285,7 +478,8 @@ def verify_planting():
             "reason": evidence.get("reason", "unknown")
         }
         
-        return jsonify(result)
+        result_cache.put(cache_key, result)
+        return jsonify({**result, "cached": False})
     
     except Exception as e:
         print(f"❌ Planting verification error: {e}")
@@ -300,9 +494,11 @@ def verify_cleanup():
     Verify cleanup activity via before/after image comparison
     Expects: two image files via multipart/form-data ('before' and 'after')
     """
-    if not cleanup_available:
+    try:
+        cleanup_utils = cleanup_entry.get()
+    except RuntimeError:
         return jsonify({"error": "Cleanup model not available"}), 500
-    
+
     try:
         # Check if both images are provided
         if 'before' not in request.files or 'after' not in request.files:
@@ -314,28 +510,35 @@ def verify_cleanup():
         if before_file.filename == '' or after_file.filename == '':
             return jsonify({"error": "No file selected"}), 400
         
-        # Save to temporary files
-        temp_dir = tempfile.gettempdir()
-        before_filename = secure_filename(before_file.filename)
-        after_filename = secure_filename(after_file.filename)
-        temp_before_path = os.path.join(temp_dir, f"cleanup_before_{before_filename}")
-        temp_after_path = os.path.join(temp_dir, f"cleanup_after_{after_filename}")
-        
-        before_file.save(temp_before_path)
-        after_file.save(temp_after_path)
-        
-        # Run cleanup verification
-        result = cleanup_verify_func(
-            temp_before_path,
-            temp_after_path,
-            confidence_threshold=0.5,
+        before_data = before_file.read()
+        after_data = after_file.read()
+
+        cache_key = result_cache.make_key(
+            "cleanup", CLEANUP_MODEL_VERSION,
+            {"confidence_threshold": CLEANUP_CONFIDENCE_THRESHOLD},
+            before_data, after_data
+        )
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            return jsonify({**cached, "cached": True})
+
+        # Decode straight from memory; nothing touches disk unless auditing is on
+        try:
+            before_img = cleanup_utils.decode_image(before_data)
+            after_img = cleanup_utils.decode_image(after_data)
+        except ValueError:
+            return jsonify({"error": "Could not decode before/after image"}), 400
+        audit_store = cleanup_utils.get_audit_store()
+        audit_id = audit_store.save(before=before_data, after=after_data) if audit_store else None
+
+        # Run cleanup verification (both images in one forward pass)
+        result = cleanup_utils.verify_cleanup(
+            before_img,
+            after_img,
+            confidence_threshold=CLEANUP_CONFIDENCE_THRESHOLD,
             log_details=True
         )
-        
-        # Clean up temp files
-        os.remove(temp_before_path)
-        os.remove(temp_after_path)
-        
+
         # Calculate overall confidence
         avg_confidence = (result['before_confidence'] + result['after_confidence']) / 2
         
@@ -357,6 +560,10 @@ def verify_cleanup():
             }
         }
         
+        result_cache.put(cache_key, response)
+        response = {**response, "cached": False}
+        if audit_id:
+            response["audit_id"] = audit_id
         return jsonify(response)
     
     except Exception as e:
@@ -371,9 +578,35 @@ def health():
     """Health check endpoint"""
     return jsonify({
         "status": "running",
-        "public_transport_model_loaded": pt_model is not None,
-        "planting_model_loaded": planting_available,
-        "cleanup_model_loaded": cleanup_available
+        "public_transport_model_loaded": pt_model_entry.ready,
+        "planting_model_loaded": planting_entry.ready,
+        "cleanup_model_loaded": cleanup_entry.ready,
+        "models": registry.status()
+    })
+
+
+@app.route('/warmup', methods=['POST'])
+def warmup():
+    """
+    Explicitly load models now
+    Expects (optional): {"models": ["public_transport", "planting", "cleanup"]}
+    """
+    data = request.get_json(silent=True) or {}
+    names = data.get("models")
+    try:
+        registry.warmup(names, background=False)
+    except KeyError as e:
+        return jsonify({"error": e.args[0]}), 400
+    return jsonify({"models": registry.status()})
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Inference scheduler and result cache metrics"""
+    return jsonify({
+        "public_transport_batcher": pt_batcher.metrics(),
+        "result_cache": result_cache.stats(),
+        "planting_pool": planting_entry.get().status() if planting_entry.ready else None
     })
 
 
@@ -381,10 +614,16 @@ if __name__ == '__main__':
     print("🚀 Starting ML Service on http://127.0.0.1:5000")
     print("Available endpoints:")
     print("  POST /verify_walk - Walk verification")
+    print("  POST /verify_walk/batch - Batch walk verification")
+    print("  POST /walk_sessions - Open incremental walk session")
+    print("  POST /walk_sessions/<id>/points - Append GPS chunk")
+    print("  POST /walk_sessions/<id>/finish - Close walk session")
     print("  POST /verify_public_transport - Public transport image verification")
     print("  POST /verify_planting - Tree planting video verification")
     print("  POST /verify_cleanup - Cleanup drive before/after verification")
+    print("  POST /warmup - Load models now")
     print("  GET  /health - Health check")
+    print("  GET  /metrics - Inference batching and cache metrics")
     port = int(os.environ.get("PORT", 5000))
     # debug=False for production
     app.run(host='0.0.0.0', port=port)
@@ -0,0 +1,168 @@
+"""
+Lazy model registry for the ML service.
+
+Each verifier registers a loader that imports its heavy dependencies
+(TensorFlow, ultralytics, ...) and builds its model. Nothing runs until the
+model is first requested, or until warmup() is called, so the service can
+start serving cheap endpoints like /verify_walk immediately.
+"""
+import os
+import threading
+import time
+import traceback
+
+NOT_LOADED = "not_loaded"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+def _rss_bytes():
+    """Resident set size of this process, or None where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def estimate_nbytes(obj):
+    """
+    Best-effort size of a model's weights: torch modules (also when wrapped
+    by ultralytics / Detector), Keras models, or objects exposing param_bytes.
+    Returns None when the size can't be determined.
+    """
+    if obj is None:
+        return None
+    if isinstance(getattr(obj, "param_bytes", None), int):
+        return obj.param_bytes
+    if hasattr(obj, "parameters") and callable(obj.parameters):
+        try:
+            return sum(p.numel() * p.element_size() for p in obj.parameters())
+        except Exception:
+            pass
+    weights = getattr(obj, "weights", None)
+    if isinstance(weights, list) and weights:
+        try:
+            return int(sum(w.numpy().nbytes for w in weights))
+        except Exception:
+            pass
+    inner = getattr(obj, "model", None)
+    if inner is not None and inner is not obj:
+        return estimate_nbytes(inner)
+    return None
+
+
+class LazyModel:
+    """A model that is loaded on first use, at most once per process"""
+
+    def __init__(self, name, loader, sizer=estimate_nbytes):
+        self.name = name
+        self._loader = loader
+        self._sizer = sizer
+        self._lock = threading.Lock()
+        self._value = None
+        self.state = NOT_LOADED
+        self.error = None
+        self.load_time_s = None
+        self.param_bytes = None
+        self.rss_delta_bytes = None
+
+    def get(self):
+        """Return the loaded model, loading it first if needed"""
+        if self.state == READY:
+            return self._value
+        with self._lock:
+            if self.state == NOT_LOADED:
+                self._load()
+        if self.state != READY:
+            raise RuntimeError(f"{self.name} model not available: {self.error}")
+        return self._value
+
+    def _load(self):
+        self.state = LOADING
+        print(f"🔄 Loading {self.name} model...")
+        rss_before = _rss_bytes()
+        t0 = time.perf_counter()
+        try:
+            self._value = self._loader()
+        except Exception as e:
+            print(f"❌ Error loading {self.name} model: {e}")
+            traceback.print_exc()
+            self.error = str(e)
+            self.state = FAILED
+            return
+        self.load_time_s = time.perf_counter() - t0
+        rss_after = _rss_bytes()
+        if rss_before is not None and rss_after is not None:
+            # approximate: other threads may allocate while we load
+            self.rss_delta_bytes = rss_after - rss_before
+        try:
+            self.param_bytes = self._sizer(self._value)
+        except Exception:
+            self.param_bytes = None
+        self.state = READY
+        print(f"✅ {self.name} model loaded in {self.load_time_s:.2f}s")
+
+    @property
+    def ready(self):
+        return self.state == READY
+
+    def status(self):
+        return {
+            "state": self.state,
+            "load_time_s": self.load_time_s,
+            "param_bytes": self.param_bytes,
+            "rss_delta_bytes": self.rss_delta_bytes,
+            "error": self.error,
+        }
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._models = {}
+
+    def register(self, name, loader, sizer=estimate_nbytes):
+        model = LazyModel(name, loader, sizer=sizer)
+        self._models[name] = model
+        return model
+
+    def __contains__(self, name):
+        return name in self._models
+
+    def __getitem__(self, name):
+        return self._models[name]
+
+    def get(self, name):
+        """Loaded model by name; raises RuntimeError if it failed to load"""
+        return self._models[name].get()
+
+    def status(self):
+        return {name: m.status() for name, m in self._models.items()}
+
+    def warmup(self, names=None, background=True):
+        """
+        Load the given models (all by default), optionally on a daemon thread.
+        Failures are recorded in the model state, not raised.
+        """
+        names = list(self._models) if names is None else list(names)
+        unknown = [n for n in names if n not in self._models]
+        if unknown:
+            raise KeyError(f"Unknown models: {', '.join(unknown)}")
+
+        def _run():
+            for name in names:
+                try:
+                    self._models[name].get()
+                except RuntimeError:
+                    pass
+
+        if not background:
+            _run()
+            return None
+        thread = threading.Thread(target=_run, name="model-warmup", daemon=True)
+        thread.start()
+        return thread
+
+
+registry = ModelRegistry()
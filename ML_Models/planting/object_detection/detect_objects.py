@@ -2,6 +2,8 @@
 import cv2
 import numpy as np
 import os
+import threading
+import time
 
 # Try to import ultralytics YOLO; if not available use fallback
 ULTRALYTICS_AVAILABLE = False
@@ -26,43 +28,116 @@ class Detector:
     Wrapper: tries YOLO (ultralytics) if available, otherwise model=None.
     Methods:
       - detect(frame): returns list of detections [{'label','conf','xyxy'}]
+      - detect_batch(frames): same, one list per frame, run batch_size frames per forward pass
     """
-    def __init__(self, model_path="yolov8n.pt", device="cpu", conf=0.25):
+    def __init__(self, model_path="yolov8n.pt", device="cpu", conf=0.25, batch_size=8):
         self.conf = conf
         self.device = device
+        self.batch_size = batch_size
+        self.model_path = str(model_path)
         self.model = None
+        t0 = time.perf_counter()
         if ULTRALYTICS_AVAILABLE:
             try:
-                self.model = YOLO(model_path)
+                # .pt runs in PyTorch; exported .onnx / _openvino_model/ run in their
+                # runtime behind the same results API (see export_yolo.py)
+                self.model = YOLO(model_path, task="detect")
                 global YOLO_LOAD_OK
                 YOLO_LOAD_OK = True
             except Exception:
                 self.model = None
                 YOLO_LOAD_OK = False
+        self.load_time_s = time.perf_counter() - t0
 
-    def detect(self, frame):
+    def _parse(self, res):
         detections = []
-        if self.model is None:
+        # ultralytics returns Boxes object on res.boxes
+        boxes = getattr(res, "boxes", None)
+        if boxes is None:
             return detections
+        xyxy = boxes.xyxy.cpu().numpy()
+        confs = boxes.conf.cpu().numpy()
+        cls_ids = boxes.cls.cpu().numpy().astype(int)
+        names = getattr(self.model, "names", {})
+        for (b, c, cid) in zip(xyxy, confs, cls_ids):
+            x1, y1, x2, y2 = map(int, b.tolist())
+            label = names.get(cid, str(cid))
+            detections.append({"label": label, "conf": float(c), "xyxy": (x1, y1, x2, y2)})
+        return detections
+
+    def detect(self, frame):
+        if self.model is None:
+            return []
         try:
             results = self.model(frame, imgsz=640, conf=self.conf, verbose=False)
-            res = results[0]
-            # ultralytics returns Boxes object on res.boxes
-            boxes = getattr(res, "boxes", None)
-            if boxes is None:
-                return detections
-            xyxy = boxes.xyxy.cpu().numpy()
-            confs = boxes.conf.cpu().numpy()
-            cls_ids = boxes.cls.cpu().numpy().astype(int)
-            names = getattr(self.model, "names", {})
-            for (b, c, cid) in zip(xyxy, confs, cls_ids):
-                x1, y1, x2, y2 = map(int, b.tolist())
-                label = names.get(cid, str(cid))
-                detections.append({"label": label, "conf": float(c), "xyxy": (x1, y1, x2, y2)})
+            return self._parse(results[0])
         except Exception:
             # If ultralytics API differences or errors occur, return empty list
             return []
-        return detections
+
+    def detect_batch(self, frames, batch_size=None):
+        """
+        Detect on a list of frames, batch_size frames (default self.batch_size)
+        per forward pass. Returns one detection list per frame, in order.
+        """
+        frames = list(frames)
+        if self.model is None:
+            return [[] for _ in frames]
+        batch_size = max(1, batch_size or self.batch_size)
+        out = []
+        for i in range(0, len(frames), batch_size):
+            chunk = frames[i:i + batch_size]
+            try:
+                results = self.model(chunk, imgsz=640, conf=self.conf, verbose=False)
+                out.extend(self._parse(res) for res in results)
+            except Exception:
+                out.extend([] for _ in chunk)
+        return out
+
+    @property
+    def param_bytes(self):
+        """Size of the model weights in memory (file size for exported models, 0 if none is loaded)"""
+        net = getattr(self.model, "model", None)
+        if net is None or not hasattr(net, "parameters"):
+            if self.model is not None and os.path.isfile(self.model_path):
+                return os.path.getsize(self.model_path)
+            return 0
+        return sum(p.numel() * p.element_size() for p in net.parameters())
+
+    def clone(self):
+        """A separate Detector with the same settings (ultralytics models are not thread-safe)"""
+        return Detector(model_path=self.model_path, device=self.device, conf=self.conf,
+                        batch_size=self.batch_size)
+
+    def info(self):
+        return {
+            "model_path": self.model_path,
+            "device": self.device,
+            "conf": self.conf,
+            "batch_size": self.batch_size,
+            "loaded": self.model is not None,
+            "load_time_s": self.load_time_s,
+            "param_bytes": self.param_bytes,
+        }
+
+# Process-wide detector registry: each (model_path, device, conf) is loaded once
+_DETECTORS = {}
+_DETECTORS_LOCK = threading.Lock()
+
+def get_detector(model_path="yolov8n.pt", device="cpu", conf=0.25):
+    """Shared Detector for this process, loaded on first request for its key"""
+    key = (str(model_path), device, float(conf))
+    with _DETECTORS_LOCK:
+        detector = _DETECTORS.get(key)
+        if detector is None:
+            detector = Detector(model_path=model_path, device=device, conf=conf)
+            _DETECTORS[key] = detector
+    return detector
+
+def loaded_detectors():
+    """Load time and memory footprint of every detector loaded in this process"""
+    with _DETECTORS_LOCK:
+        return [d.info() for d in _DETECTORS.values()]
 
 def detect_green_blob(frame, roi=None, min_area_px=300):
     """
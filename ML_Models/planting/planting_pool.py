@@ -0,0 +1,234 @@
+# planting/planting_pool.py
+"""
+Size-bounded process pool for planting verification.
+
+Frame extraction, YOLO detection and optical flow are CPU heavy, so they run
+in dedicated worker processes instead of on the web server's request thread.
+Each worker loads its Detector once in the pool initializer and reuses it for
+every job it runs.
+
+Jobs carry a deadline: a worker stops pulling frames once it has passed, and
+a job that still has not finished shortly after it (stuck in decoding or
+inference) gets its workers recycled. A pool broken by a dead worker (OOM,
+a cv2 crash on a bad video) is rebuilt, so only the jobs running at that
+moment fail.
+
+The pool is per web server process, and the request thread still waits on
+the result; run the service under gunicorn with threaded (gthread) workers
+so other requests are served meanwhile (see gunicorn.conf.py). The default
+size splits half the cores across the WEB_CONCURRENCY server processes, so
+the total number of planting processes on the host stays bounded.
+"""
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+TIMEOUT_GRACE_S = 10.0  # extra wait for a worker to notice its deadline
+
+
+class PlantingTimeout(Exception):
+    """The job did not finish within its timeout"""
+
+
+class PlantingWorkerError(Exception):
+    """A worker process died while running the job"""
+
+
+_detector = None  # per-worker Detector, set by _init_worker
+
+
+def _init_worker(model_path, device, conf):
+    global _detector
+    from object_detection.detect_objects import get_detector
+    _detector = get_detector(model_path=model_path, device=device, conf=conf)
+
+
+def _worker_info():
+    from object_detection.detect_objects import loaded_detectors
+    return {"pid": os.getpid(), "detectors": loaded_detectors()}
+
+
+def run_planting_job(video_path, sample_fps=1, max_frames=60, min_plant_frames=1, motion_threshold=0.6,
+                     sampling_mode="grab", sampler="uniform", keyframe_options=None, batch_size=8,
+                     early_exit=False, early_exit_margin=0.25,
+                     motion_backend="farneback", motion_options=None, frame_workers=1, debug_dir=None,
+                     deadline=None):
+    """
+    Worker entry point: stream frames from video_path into verification.
+    sampling_mode: frame skipping strategy, see iter_frames
+    sampler, keyframe_options: uniform or scene-change keyframes within max_frames, see sample_frames
+    batch_size: frames per YOLO forward pass
+    early_exit, early_exit_margin: stop once evidence is sufficient, see verify_planting_from_stream
+    motion_backend, motion_options: motion estimator, see video_processing.motion
+    frame_workers: threads analysing frames in parallel within this job
+    debug_dir: optional folder to also dump the sampled frames as JPEG
+    (one sub-folder per job).
+    deadline: time.time() after which the job raises PlantingTimeout
+    instead of pulling more frames.
+    Returns (num_frames, passed, evidence).
+    """
+    from video_processing.extract_frames import sample_frames
+    from video_processing.verify_video import verify_planting_from_stream
+    from video_processing.motion import get_motion_estimator
+
+    if debug_dir:
+        debug_dir = os.path.join(debug_dir, f"job_{os.getpid()}_{time.time_ns()}")
+    frames = sample_frames(video_path, sampler=sampler, sample_fps=sample_fps, max_frames=max_frames,
+                           debug_dir=debug_dir, mode=sampling_mode, keyframe_options=keyframe_options)
+    if deadline is not None:
+        frames = _until(frames, deadline)
+    passed, evidence = verify_planting_from_stream(
+        frames,
+        min_plant_frames=min_plant_frames,
+        motion_threshold=motion_threshold,
+        detector=_detector,
+        batch_size=batch_size,
+        early_exit=early_exit,
+        early_exit_margin=early_exit_margin,
+        motion_estimator=get_motion_estimator(motion_backend, **(motion_options or {})),
+        workers=frame_workers
+    )
+    return evidence.get("num_frames", 0), passed, evidence
+
+
+def _until(frames, deadline):
+    """Pass frames through until deadline, then raise PlantingTimeout"""
+    try:
+        for frame in frames:
+            if time.time() > deadline:
+                raise PlantingTimeout("planting job ran past its deadline")
+            yield frame
+    finally:
+        if hasattr(frames, "close"):
+            frames.close()
+
+
+def default_workers(web_workers=None):
+    """
+    Half the cores, so cheap endpoints keep the rest, split across the web
+    server processes (WEB_CONCURRENCY) that each run their own pool
+    """
+    if web_workers is None:
+        web_workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+    return max(1, (os.cpu_count() or 2) // 2 // max(1, web_workers))
+
+
+def _kill_workers(executor):
+    """Terminate an executor's worker processes (stuck jobs can't be cancelled)"""
+    kill = getattr(executor, "kill_workers", None)  # Python 3.14+
+    if kill is not None:
+        kill()
+        return
+    for proc in list((getattr(executor, "_processes", None) or {}).values()):
+        proc.kill()
+
+
+class PlantingPool:
+    def __init__(self, max_workers=None, model_path="yolov8n.pt", device="cpu", conf=0.25,
+                 timeout_grace_s=TIMEOUT_GRACE_S):
+        self.max_workers = max_workers or default_workers()
+        self._initargs = (model_path, device, conf)
+        self.timeout_grace_s = timeout_grace_s
+        self._lock = threading.Lock()
+        self._executor = self._new_executor()
+        self.submitted = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.restarts = 0
+        self.workers = {}
+
+    def _new_executor(self):
+        # spawn: never fork a process that may already hold TensorFlow/torch threads
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=self._initargs,
+        )
+
+    def _record_worker(self, future):
+        if not future.cancelled() and future.exception() is None:
+            info = future.result()
+            self.workers[info["pid"]] = info["detectors"]
+
+    def warmup(self, wait=False):
+        """
+        Start every worker (and load its detector). With wait=True, block until
+        they are up. Each worker's detector load time and footprint is recorded.
+        """
+        futures = [self._executor.submit(_worker_info) for _ in range(self.max_workers)]
+        if wait:
+            # record here, not in a done-callback, so workers is filled on return
+            for f in futures:
+                info = f.result()
+                self.workers[info["pid"]] = info["detectors"]
+        else:
+            for f in futures:
+                f.add_done_callback(self._record_worker)
+        return futures
+
+    def _restart(self, executor):
+        """Replace executor (if it is still the current one) with a fresh pool"""
+        with self._lock:
+            if self._executor is not executor:
+                return  # another request already restarted it
+            _kill_workers(executor)
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+            self.workers = {}
+            self.restarts += 1
+        self.warmup(wait=False)
+
+    def submit(self, video_path, **params):
+        self.submitted += 1
+        return self._executor.submit(run_planting_job, video_path, **params)
+
+    def run(self, video_path, timeout=None, **params):
+        """
+        Submit a job and block until its result is ready.
+        Raises PlantingTimeout when it takes longer than timeout seconds and
+        PlantingWorkerError when its worker dies; the pool stays usable.
+        """
+        executor = self._executor
+        if timeout is not None:
+            params["deadline"] = time.time() + timeout
+        try:
+            future = executor.submit(run_planting_job, video_path, **params)
+        except BrokenProcessPool:
+            # broken by an earlier crash that nobody waited on
+            self._restart(executor)
+            executor = self._executor
+            future = executor.submit(run_planting_job, video_path, **params)
+        self.submitted += 1
+
+        try:
+            return future.result(timeout=None if timeout is None else timeout + self.timeout_grace_s)
+        except PlantingTimeout:
+            self.timeouts += 1
+            raise
+        except FuturesTimeout:
+            self.timeouts += 1
+            if not future.cancel():
+                # still running past its deadline: the worker is stuck, recycle it
+                self._restart(executor)
+            raise PlantingTimeout(f"planting job did not finish within {timeout:.0f}s")
+        except BrokenProcessPool:
+            self.crashes += 1
+            self._restart(executor)
+            raise PlantingWorkerError("planting worker process died; the pool was restarted")
+
+    def status(self):
+        return {
+            "max_workers": self.max_workers,
+            "submitted": self.submitted,
+            "timeouts": self.timeouts,
+            "crashes": self.crashes,
+            "restarts": self.restarts,
+            "workers": self.workers,
+        }
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
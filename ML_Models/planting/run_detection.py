@@ -4,13 +4,13 @@ Standalone live/demo visual detector (runs in terminal/GUI).
 Change LIVE_MODE flag to switch webcam vs demo video.
 """
 import cv2, os
-from object_detection.detect_objects import Detector, detect_green_blob
+from object_detection.detect_objects import get_detector, detect_green_blob
 
 LIVE_MODE = False    # True -> webcam, False -> demo video file
 DEMO_VIDEO = os.path.join("uploads", "videos", "demo_video.mp4")
 
 def main():
-    detector = Detector()  # tries to load YOLO if available
+    detector = get_detector()  # tries to load YOLO if available
     if LIVE_MODE:
         cap = cv2.VideoCapture(0)
         print("Running LIVE (webcam). Press 'q' to quit.")
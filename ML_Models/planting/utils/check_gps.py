@@ -1,9 +1,31 @@
 # planting/utils/check_gps.py
-import json, subprocess, re, os
+import json, subprocess, re, os, shutil
+from struct import error as struct_error
+
+try:
+    from utils.mp4_meta import read_location, Mp4MetaError
+except ImportError:  # run from inside utils/
+    from mp4_meta import read_location, Mp4MetaError
+
+def _extract_gps_from_video(video_path):
+    """
+    Location tag of a video as an ISO 6709 string, or None.
+    MP4/MOV files are parsed in-process (mp4_meta); ffprobe is only spawned
+    for other containers or files the parser can't read.
+    """
+    if not os.path.exists(video_path):
+        return None
+    try:
+        return read_location(video_path)
+    except (Mp4MetaError, OSError, struct_error):
+        pass
+    if shutil.which("ffprobe") is None:
+        return None
+    return _extract_gps_from_video_ffprobe(video_path)
 
 def _extract_gps_from_video_ffprobe(video_path):
     """
-    Optional: uses ffprobe to read metadata tags. Requires ffprobe installed.
+    Fallback: uses ffprobe to read metadata tags. Requires ffprobe installed.
     Returns string like '+12.3456+098.7654' or None.
     """
     if not os.path.exists(video_path):
@@ -49,7 +71,7 @@ def validate_gps(video_path=None, gps_json=None, allowed_bbox=None):
     else:
         if not video_path:
             return False, {"reason": "no_video_or_gps_provided"}
-        s = _extract_gps_from_video_ffprobe(video_path)
+        s = _extract_gps_from_video(video_path)
         if not s:
             return False, {"reason": "no_gps_found_in_video"}
         gps = _parse_iso6709(s)
@@ -1,5 +1,6 @@
 # planting/utils/cleanup.py
-import shutil, os
+import shutil, os, tempfile
+from contextlib import contextmanager
 
 def cleanup_paths(paths):
     for p in paths:
@@ -16,3 +17,22 @@ def ensure_empty_dir(path):
         shutil.rmtree(path, ignore_errors=True)
     os.makedirs(path, exist_ok=True)
     return path
+
+@contextmanager
+def request_workspace(prefix="planting_", base_dir=None):
+    """
+    Private scratch directory for one request, removed on exit even if the
+    request fails. Names are unique, so concurrent requests never share files.
+    """
+    path = tempfile.mkdtemp(prefix=prefix, dir=base_dir)
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+def upload_path(workspace, filename, name="upload", default_ext=".mp4"):
+    """Path inside workspace for an upload; keeps only the client's file extension"""
+    ext = os.path.splitext(filename or "")[1].lower()
+    if not ext[1:].isalnum():
+        ext = default_ext
+    return os.path.join(workspace, name + ext)
@@ -0,0 +1,170 @@
+# planting/utils/mp4_meta.py
+"""
+Minimal in-process reader for MP4/MOV (ISO BMFF / QuickTime) metadata.
+
+Only box headers are read while walking the file; the big sample tables
+(trak) and media data (mdat) are skipped with seeks. The payloads of the
+metadata boxes themselves (udta, meta) are read up to max_box_bytes each,
+so a request reads a few KB no matter how long the video is.
+
+Locations are found in:
+  - moov/udta/©xyz                                  (Android, older iOS)
+  - moov/meta or moov/udta/meta keys + ilst entries (iOS, e.g.
+    com.apple.quicktime.location.ISO6709)
+"""
+import struct
+
+MAX_BOX_BYTES = 1 << 20      # cap on any single metadata box payload
+MAX_BOXES = 4096             # cap on box headers visited per file
+TOP_LEVEL_TYPES = {b"ftyp", b"moov", b"mdat", b"free", b"skip", b"wide", b"uuid", b"pnot", b"meta", b"moof", b"mfra"}
+LOCATION_KEYS = ("com.apple.quicktime.location.ISO6709", "©xyz", "location")
+
+
+class Mp4MetaError(ValueError):
+    """Not an MP4/MOV file, or its box structure is broken"""
+
+
+def _iter_boxes(f, start, end, budget):
+    """Yield (type, payload_offset, payload_size) for boxes in [start, end)"""
+    pos = start
+    while pos + 8 <= end:
+        budget[0] -= 1
+        if budget[0] < 0:
+            raise Mp4MetaError("too many boxes")
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack(">I4s", header)
+        header_size = 8
+        if size == 1:
+            large = f.read(8)
+            if len(large) < 8:
+                return
+            size = struct.unpack(">Q", large)[0]
+            header_size = 16
+        elif size == 0:
+            size = end - pos
+        if size < header_size or pos + size > end:
+            raise Mp4MetaError(f"bad size for box {box_type!r}")
+        yield box_type, pos + header_size, size - header_size
+        pos += size
+
+
+def _read_payload(f, offset, size, max_box_bytes):
+    if size > max_box_bytes:
+        return None
+    f.seek(offset)
+    data = f.read(size)
+    return data if len(data) == size else None
+
+
+def _iter_boxes_in(data):
+    """Same as _iter_boxes for a payload already in memory: (type, bytes)"""
+    pos = 0
+    while pos + 8 <= len(data):
+        size, box_type = struct.unpack_from(">I4s", data, pos)
+        header_size = 8
+        if size == 1 and pos + 16 <= len(data):
+            size = struct.unpack_from(">Q", data, pos + 8)[0]
+            header_size = 16
+        elif size == 0:
+            size = len(data) - pos
+        if size < header_size or pos + size > len(data):
+            return
+        yield box_type, data[pos + header_size:pos + size]
+        pos += size
+
+
+def _decode_text(raw):
+    return raw.split(b"\x00", 1)[0].decode("utf-8", errors="replace").strip()
+
+
+def _parse_udta(data, tags):
+    for box_type, payload in _iter_boxes_in(data):
+        if box_type == b"\xa9xyz" and len(payload) >= 4:
+            # QuickTime user data text: 16-bit length, 16-bit language, text
+            length = struct.unpack_from(">H", payload)[0]
+            tags["©xyz"] = _decode_text(payload[4:4 + length])
+        elif box_type == b"meta":
+            _parse_meta(payload, tags)
+
+
+def _parse_meta(data, tags):
+    # ISO meta is a full box (4 bytes version/flags), QuickTime meta is not
+    if data[4:8] not in (b"hdlr", b"keys", b"ilst"):
+        data = data[4:]
+    keys = []
+    items = []
+    for box_type, payload in _iter_boxes_in(data):
+        if box_type == b"keys" and len(payload) >= 8:
+            count = struct.unpack_from(">I", payload, 4)[0]
+            pos = 8
+            for _ in range(count):
+                if pos + 8 > len(payload):
+                    break
+                key_size = struct.unpack_from(">I", payload, pos)[0]
+                if key_size < 8:
+                    break
+                keys.append(_decode_text(payload[pos + 8:pos + key_size]))
+                pos += key_size
+        elif box_type == b"ilst":
+            items = list(_iter_boxes_in(payload))
+    for item_type, payload in items:
+        index = struct.unpack(">I", item_type)[0]
+        if item_type == b"\xa9xyz":
+            name = "©xyz"
+        elif 1 <= index <= len(keys):
+            name = keys[index - 1]
+        else:
+            continue
+        for box_type, value in _iter_boxes_in(payload):
+            # data box: 4 bytes type indicator, 4 bytes locale, then the value
+            if box_type == b"data" and len(value) >= 8:
+                tags[name] = _decode_text(value[8:])
+                break
+
+
+def read_metadata_tags(path, max_box_bytes=MAX_BOX_BYTES):
+    """
+    Text metadata tags of an MP4/MOV file as {key: value}, e.g.
+    {"com.apple.quicktime.location.ISO6709": "+37.3349-122.0090+010.000/"}.
+    Raises Mp4MetaError if the file is not an ISO BMFF / QuickTime container.
+    """
+    tags = {}
+    budget = [MAX_BOXES]
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        file_size = f.tell()
+        moov = None
+        for i, (box_type, offset, size) in enumerate(_iter_boxes(f, 0, file_size, budget)):
+            if i == 0 and box_type not in TOP_LEVEL_TYPES:
+                raise Mp4MetaError("not an MP4/MOV file")
+            if box_type == b"moov":
+                moov = (offset, size)
+                break
+        if moov is None:
+            return tags
+        for box_type, offset, size in _iter_boxes(f, moov[0], moov[0] + moov[1], budget):
+            if box_type not in (b"udta", b"meta"):
+                continue
+            data = _read_payload(f, offset, size, max_box_bytes)
+            if data is None:
+                continue
+            if box_type == b"udta":
+                _parse_udta(data, tags)
+            else:
+                _parse_meta(data, tags)
+    return tags
+
+
+def read_location(path, max_box_bytes=MAX_BOX_BYTES):
+    """ISO 6709 location string from an MP4/MOV file, or None if it has none"""
+    tags = read_metadata_tags(path, max_box_bytes=max_box_bytes)
+    for key in LOCATION_KEYS:
+        if tags.get(key):
+            return tags[key]
+    for key, val in tags.items():
+        if val and ("location" in key.lower() or "iso6709" in key.lower()):
+            return val
+    return None
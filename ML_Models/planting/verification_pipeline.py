@@ -1,23 +1,20 @@
 # planting/verification_pipeline.py
 from fastapi import FastAPI, UploadFile, File, Form
 import shutil, os, json
+from contextlib import ExitStack
 from pathlib import Path
 
-from utils.download_media import save_uploaded_video
 from utils.check_gps import validate_gps
-from utils.cleanup import ensure_empty_dir, cleanup_paths
-from video_processing.extract_frames import extract_frames
-from video_processing.verify_video import verify_planting_from_frames
+from utils.cleanup import request_workspace, upload_path
+from video_processing.extract_frames import iter_frames
+from video_processing.verify_video import verify_planting_from_stream
 
 app = FastAPI()
 BASE = Path(__file__).parent.resolve()
 UPLOADS_VIDEOS = BASE / ".." / "uploads" / "videos"
-UPLOADS_FRAMES = BASE / ".." / "uploads" / "frames"
 # normalize
 UPLOADS_VIDEOS = UPLOADS_VIDEOS.resolve()
-UPLOADS_FRAMES = UPLOADS_FRAMES.resolve()
 os.makedirs(UPLOADS_VIDEOS, exist_ok=True)
-os.makedirs(UPLOADS_FRAMES, exist_ok=True)
 
 @app.get("/")
 def root():
@@ -31,24 +28,23 @@ async def verify_endpoint(file: UploadFile = File(None), lat: float = Form(None)
     - lat, lon : optional GPS provided by frontend (preferred)
     - use_demo: if True, uses uploads/videos/demo_video.mp4 instead of uploaded file
     """
-    # Decide source video
-    if use_demo:
-        video_path = (BASE / ".." / "uploads" / "videos" / "demo_video.mp4").resolve()
-        if not video_path.exists():
-            return {"status":"fail","reason":"demo_video_missing"}
-    else:
-        if file is None:
-            return {"status":"fail","reason":"no_file_provided"}
-        saved = save_uploaded_video(file.file if hasattr(file, "file") else file.filename, dest_folder=str(UPLOADS_VIDEOS))
-        # save_uploaded_video handles paths or file-like? we have UploadFile - save explicitly
-        # For UploadFile, write directly:
-        if hasattr(file, "filename"):
-            video_path = UPLOADS_VIDEOS / file.filename
+    with ExitStack() as stack:
+        # Decide source video
+        if use_demo:
+            video_path = (BASE / ".." / "uploads" / "videos" / "demo_video.mp4").resolve()
+            if not video_path.exists():
+                return {"status":"fail","reason":"demo_video_missing"}
+        else:
+            if file is None or not hasattr(file, "file"):
+                return {"status":"fail","reason":"no_file_provided"}
+            # private per-request copy, removed when the request finishes
+            workspace = stack.enter_context(request_workspace(prefix="planting_"))
+            video_path = upload_path(workspace, file.filename)
             with open(video_path, "wb") as f:
                 shutil.copyfileobj(file.file, f)
-        else:
-            return {"status":"fail","reason":"invalid_file"}
+        return _verify_video(video_path, lat, lon)
 
+def _verify_video(video_path, lat=None, lon=None):
     # Validate GPS (prefer lat/lon passed)
     gps_json = None
     if lat is not None and lon is not None:
@@ -58,19 +54,12 @@ async def verify_endpoint(file: UploadFile = File(None), lat: float = Form(None)
         # still continue optional: return fail now
         return {"status":"fail", "reason":"gps_failed", "info": gps_info}
 
-    # Extract frames
-    ensure_empty_dir(str(UPLOADS_FRAMES))
-    frames = extract_frames(str(video_path), out_dir=str(UPLOADS_FRAMES), sample_fps=1, max_frames=60)
-    if not frames:
-        cleanup_paths([str(UPLOADS_FRAMES)])
+    # Stream decoded frames straight into verification (nothing written to disk)
+    frames = iter_frames(str(video_path), sample_fps=1, max_frames=60)
+    passed, evidence = verify_planting_from_stream(frames, min_plant_frames=1, motion_threshold=0.6)
+    if evidence.get("reason") == "no_frames":
         return {"status":"fail","reason":"no_frames_extracted"}
 
-    # Verify planting
-    passed, evidence = verify_planting_from_frames(str(UPLOADS_FRAMES), min_plant_frames=1, motion_threshold=0.6)
-
-    # Cleanup frames (keep video)
-    cleanup_paths([str(UPLOADS_FRAMES)])
-
     response = {
         "status": "success" if passed else "fail",
         "passed": bool(passed),
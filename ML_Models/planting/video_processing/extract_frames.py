@@ -1,38 +1,252 @@
 # planting/video_processing/extract_frames.py
-import cv2, os
+import bisect, cv2, os, numpy as np
+from collections import namedtuple
 from pathlib import Path
 
-def extract_frames(video_path, out_dir="uploads/frames", sample_fps=1, max_frames=None):
+SAMPLING_MODES = ("grab", "seek", "read")
+SAMPLERS = ("uniform", "keyframes")
+KEYFRAME_SIGNALS = ("diff", "hist")
+
+# A keyframe plus what verification needs to measure motion on it the way
+# uniform sampling does: ref is the frame motion_gap_s earlier (None near the
+# start), weight the seconds of its ref->frame window not already covered by
+# the previous keyframe's window, duration the length of the video in seconds.
+SampledFrame = namedtuple("SampledFrame", ["image", "ref", "weight", "duration"])
+
+def iter_frames(video_path, sample_fps=1, max_frames=None, debug_dir=None, mode="grab"):
     """
-    Extract frames from video_path into out_dir.
-    sample_fps: frames per second to save (1 => save 1 fps)
-    max_frames: maximum total frames to extract (None => no limit)
-    Returns list of saved frame paths.
+    Yield decoded BGR frames from video_path, sampled at sample_fps.
+    max_frames: maximum total frames to yield (None => no limit)
+    debug_dir: optional debug sink; every yielded frame is also written there as JPEG.
+    mode: how skipped frames are handled
+      - "grab": grab() skipped frames (demux + decode, no BGR conversion/copy),
+                retrieve() only the kept ones; same frames as "read"
+      - "seek": jump straight to each kept frame index (cheapest on long steps,
+                falls back to "grab" when the container can't seek)
+      - "read": legacy behaviour, read() and convert every frame
+    Nothing is written to disk unless debug_dir is given.
     """
-    os.makedirs(out_dir, exist_ok=True)
+    if mode not in SAMPLING_MODES:
+        raise ValueError(f"Unknown sampling mode: {mode}")
     cap = cv2.VideoCapture(str(video_path))
     if not cap.isOpened():
         raise RuntimeError(f"Cannot open video: {video_path}")
+    if debug_dir:
+        os.makedirs(debug_dir, exist_ok=True)
+
+    try:
+        video_fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+        step = max(1, int(round(video_fps / float(sample_fps))))
+        if mode == "seek" and not cap.set(cv2.CAP_PROP_POS_FRAMES, 0):
+            mode = "grab"
+        idx = 0
+        saved = 0
+        while True:
+            if mode == "read":
+                ret, frame = cap.read()
+                keep = ret and idx % step == 0
+            elif mode == "grab":
+                ret = cap.grab()
+                keep = ret and idx % step == 0
+                if keep:
+                    ret, frame = cap.retrieve()
+            else:
+                # seek: position on the next kept frame and decode only that one
+                if idx and not cap.set(cv2.CAP_PROP_POS_FRAMES, idx):
+                    break
+                ret, frame = cap.read()
+                keep = ret
+            if not ret:
+                break
+            if keep:
+                if debug_dir:
+                    cv2.imwrite(str(Path(debug_dir) / f"frame_{saved:05d}.jpg"), frame)
+                yield frame
+                saved += 1
+                if max_frames and saved >= max_frames:
+                    break
+            idx += step if mode == "seek" else 1
+    finally:
+        cap.release()
 
-    video_fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
-    step = max(1, int(round(video_fps / float(sample_fps))))
-    frame_paths = []
-    idx = 0
-    saved = 0
-    while True:
-        ret, frame = cap.read()
-        if not ret:
+def _change_score(prev_small, small, signal):
+    if signal == "hist":
+        h1 = cv2.calcHist([prev_small], [0], None, [32], [0, 256])
+        h2 = cv2.calcHist([small], [0], None, [32], [0, 256])
+        return float(1.0 - cv2.compareHist(h1, h2, cv2.HISTCMP_CORREL))
+    return float(np.mean(cv2.absdiff(prev_small, small))) / 255.0
+
+def probe_scene_changes(video_path, probe_fps=5, probe_width=96, signal="diff"):
+    """
+    Cheap pass over the video: every probe_fps-th second frame is downscaled
+    to probe_width (grayscale) and scored by how much it changed since the
+    previous probe. Returns (frame_indices, scores, video_fps); the first
+    probe scores inf so it is always eligible.
+    """
+    if signal not in KEYFRAME_SIGNALS:
+        raise ValueError(f"Unknown keyframe signal: {signal}")
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open video: {video_path}")
+    indices, scores = [], []
+    try:
+        video_fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+        step = max(1, int(round(video_fps / float(probe_fps))))
+        prev_small = None
+        idx = 0
+        while cap.grab():
+            if idx % step == 0:
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                h, w = frame.shape[:2]
+                size = (probe_width, max(1, int(round(h * probe_width / w))))
+                small = cv2.cvtColor(cv2.resize(frame, size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+                indices.append(idx)
+                scores.append(float("inf") if prev_small is None else _change_score(prev_small, small, signal))
+                prev_small = small
+            idx += 1
+    finally:
+        cap.release()
+    return indices, scores, video_fps
+
+def select_keyframes(indices, scores, budget, min_gap=1, uniform_share=0.25, min_change=0.005):
+    """
+    Pick at most budget frame indices: uniform_share of the budget evenly
+    spread over the video (so no stretch is skipped entirely), the rest the
+    highest-scoring scene changes above min_change, keeping at least min_gap
+    frames between any two picks. Static videos therefore use less than the
+    budget. Returns the picks in frame order.
+    """
+    if not indices or budget <= 0:
+        return []
+    picked = []
+
+    def _try(idx):
+        pos = bisect.bisect_left(picked, idx)
+        if pos < len(picked) and picked[pos] - idx < min_gap:
+            return
+        if pos > 0 and idx - picked[pos - 1] < min_gap:
+            return
+        picked.insert(pos, idx)
+
+    n_uniform = min(budget, max(1, int(round(budget * uniform_share))))
+    for i in np.linspace(0, len(indices) - 1, n_uniform).round().astype(int):
+        _try(indices[i])
+    for i in np.argsort(scores, kind="stable")[::-1]:
+        if len(picked) >= budget or scores[i] < min_change:
             break
-        if idx % step == 0:
-            fname = Path(out_dir) / f"frame_{saved:05d}.jpg"
-            cv2.imwrite(str(fname), frame)
-            frame_paths.append(str(fname))
-            saved += 1
-            if max_frames and saved >= max_frames:
+        _try(indices[i])
+    return picked
+
+def iter_keyframes(video_path, max_frames=30, probe_fps=5, probe_width=96, min_gap_s=0.5, signal="diff",
+                   uniform_share=0.25, min_change=0.005, motion_gap_s=1.0, debug_dir=None):
+    """
+    Adaptive alternative to iter_frames: probe the video cheaply (see
+    probe_scene_changes), choose up to max_frames keyframes where the scene
+    changes (see select_keyframes), then decode only those, in order. Static
+    stretches get few frames, short bursts of activity more.
+    Keyframes are picked for maximal change and unevenly spaced, so motion
+    between consecutive ones is not comparable to uniform sampling. With
+    motion_gap_s set, each keyframe is yielded as a SampledFrame carrying the
+    frame motion_gap_s earlier, so motion is measured over the same gap as
+    uniform sampling, and avg_motion becomes the motion integrated over the
+    measured windows divided by the video length (time not measured counts
+    as still; see verify_planting_from_stream). That matches uniform
+    sampling on activity the keyframes cover and errs low, never high,
+    elsewhere. With motion_gap_s=None bare frames are yielded.
+    The second pass seeks to the chosen frames (and their references)
+    instead of decoding the whole video again, when the container can seek.
+    """
+    indices, scores, video_fps = probe_scene_changes(video_path, probe_fps=probe_fps,
+                                                     probe_width=probe_width, signal=signal)
+    min_gap = max(1, int(round(min_gap_s * video_fps)))
+    targets = select_keyframes(indices, scores, max_frames or len(indices), min_gap=min_gap,
+                               uniform_share=uniform_share, min_change=min_change)
+    if not targets:
+        return
+    if debug_dir:
+        os.makedirs(debug_dir, exist_ok=True)
+
+    refs = {}
+    weights = {}
+    duration = indices[-1] / video_fps
+    if motion_gap_s:
+        gap = max(1, int(round(motion_gap_s * video_fps)))
+        refs = {t: t - gap for t in targets if t - gap >= 0}
+        weights = {t: min(gap, t - prev) / video_fps for prev, t in zip([0] + targets, targets)}
+    needed = sorted(set(targets) | set(refs.values()))
+    target_set = set(targets)
+    keep_for = {}  # decoded frame index -> number of keyframes still needing it as reference
+    for r in refs.values():
+        keep_for[r] = keep_for.get(r, 0) + 1
+
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open video: {video_path}")
+    try:
+        can_seek = cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        seek_ahead = max(1, int(round(video_fps)))  # shorter jumps are cheaper to grab through
+        decoded = {}
+        pos = 0  # index of the next frame the capture will return
+        saved = 0
+        for idx in needed:
+            if can_seek and idx - pos > seek_ahead and cap.set(cv2.CAP_PROP_POS_FRAMES, idx):
+                pos = idx
+            while pos < idx and cap.grab():
+                pos += 1
+            if pos != idx:
+                break
+            ret, frame = cap.read()
+            if not ret:
                 break
-        idx += 1
-    cap.release()
-    return frame_paths
+            pos += 1
+            if idx in keep_for:
+                decoded[idx] = frame
+            if idx not in target_set:
+                continue
+            if debug_dir:
+                cv2.imwrite(str(Path(debug_dir) / f"frame_{saved:05d}.jpg"), frame)
+            saved += 1
+            if not motion_gap_s:
+                yield frame
+                continue
+            ref = None
+            if idx in refs:
+                ref = decoded.get(refs[idx])
+                keep_for[refs[idx]] -= 1
+                if not keep_for[refs[idx]]:
+                    decoded.pop(refs[idx], None)
+            yield SampledFrame(frame, ref, weights[idx], duration)
+    finally:
+        cap.release()
+
+def sample_frames(video_path, sampler="uniform", sample_fps=1, max_frames=None, debug_dir=None, mode="grab",
+                  keyframe_options=None):
+    """
+    Frame source for verification by sampler name: "uniform" is iter_frames
+    at sample_fps, "keyframes" is iter_keyframes with max_frames as budget,
+    measuring motion over the uniform sampler's 1 / sample_fps gap.
+    """
+    if sampler == "uniform":
+        return iter_frames(video_path, sample_fps=sample_fps, max_frames=max_frames, debug_dir=debug_dir, mode=mode)
+    if sampler == "keyframes":
+        options = {"motion_gap_s": 1.0 / sample_fps, **(keyframe_options or {})}
+        return iter_keyframes(video_path, max_frames=max_frames, debug_dir=debug_dir, **options)
+    raise ValueError(f"Unknown sampler: {sampler}")
+
+def extract_frames(video_path, out_dir="uploads/frames", sample_fps=1, max_frames=None, mode="grab"):
+    """
+    Extract frames from video_path into out_dir.
+    sample_fps: frames per second to save (1 => save 1 fps)
+    max_frames: maximum total frames to extract (None => no limit)
+    mode: frame skipping strategy, see iter_frames
+    Returns list of saved frame paths.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    frames = iter_frames(video_path, sample_fps=sample_fps, max_frames=max_frames, debug_dir=out_dir, mode=mode)
+    count = sum(1 for _ in frames)
+    return [str(Path(out_dir) / f"frame_{i:05d}.jpg") for i in range(count)]
 
 if __name__ == "__main__":
     frames = extract_frames("uploads/videos/demo_video.mp4", out_dir="uploads/frames", sample_fps=1, max_frames=30)
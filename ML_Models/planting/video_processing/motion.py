@@ -0,0 +1,134 @@
+# planting/video_processing/motion.py
+"""
+Pluggable motion estimators for planting verification.
+
+Every estimator is called as estimator(prev_gray, gray, roi=None) and returns
+the mean motion inside roi (x1, y1, x2, y2), or over the whole frame.
+  - farneback: dense Farneback flow (the original mean_optical_flow)
+  - dis:       DIS optical flow, much cheaper than Farneback
+  - diff:      mean absolute frame difference; not in pixel units, so it
+               has no default motion_threshold and one must be tuned for it
+Flow backends can compute flow only on the ROI plus a padding margin
+(roi_only) and on a downscaled image (downscale < 1); flow magnitudes are
+scaled back to full-resolution pixels so thresholds stay comparable.
+"""
+import cv2
+import numpy as np
+
+
+def _clamp_roi(roi, shape):
+    h, w = shape[:2]
+    x1, y1, x2, y2 = roi
+    x1, y1 = max(0, int(x1)), max(0, int(y1))
+    x2, y2 = min(w, int(x2)), min(h, int(y2))
+    if x2 <= x1 or y2 <= y1:
+        return None
+    return x1, y1, x2, y2
+
+
+class MotionEstimator:
+    name = "base"
+    default_threshold = 0.6  # mean flow in pixels, tuned on Farneback
+
+    def __init__(self, roi_only=True, pad=32, downscale=1.0):
+        if not 0 < downscale <= 1:
+            raise ValueError("downscale must be in (0, 1]")
+        self.roi_only = roi_only
+        self.pad = int(pad)
+        self.downscale = float(downscale)
+
+    def __call__(self, prev_gray, gray, roi=None):
+        box = _clamp_roi(roi, gray.shape) if roi else None
+        if box is not None and self.roi_only:
+            # work on the ROI plus a margin so flow near its edges stays valid
+            h, w = gray.shape[:2]
+            x1, y1, x2, y2 = box
+            cx1, cy1 = max(0, x1 - self.pad), max(0, y1 - self.pad)
+            cx2, cy2 = min(w, x2 + self.pad), min(h, y2 + self.pad)
+            prev_gray = prev_gray[cy1:cy2, cx1:cx2]
+            gray = gray[cy1:cy2, cx1:cx2]
+            box = (x1 - cx1, y1 - cy1, x2 - cx1, y2 - cy1)
+
+        scale = self.downscale
+        if scale < 1:
+            size = (max(1, int(round(gray.shape[1] * scale))), max(1, int(round(gray.shape[0] * scale))))
+            prev_gray = cv2.resize(prev_gray, size, interpolation=cv2.INTER_AREA)
+            gray = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+            if box is not None:
+                box = tuple(int(round(v * scale)) for v in box)
+                box = _clamp_roi(box, gray.shape)
+
+        mag = self._magnitude(prev_gray, gray)
+        if box is not None:
+            x1, y1, x2, y2 = box
+            mag = mag[y1:y2, x1:x2]
+        return float(np.mean(mag)) / self._unit_scale()
+
+    def _unit_scale(self):
+        return self.downscale
+
+    def _magnitude(self, prev_gray, gray):
+        raise NotImplementedError
+
+
+class FarnebackMotion(MotionEstimator):
+    name = "farneback"
+
+    def _magnitude(self, prev_gray, gray):
+        flow = cv2.calcOpticalFlowFarneback(prev_gray, gray, None,
+                                            pyr_scale=0.5, levels=3, winsize=15,
+                                            iterations=3, poly_n=5, poly_sigma=1.2, flags=0)
+        mag, _ = cv2.cartToPolar(flow[..., 0], flow[..., 1])
+        return mag
+
+
+class DISMotion(MotionEstimator):
+    name = "dis"
+
+    def __init__(self, preset=cv2.DISOPTICAL_FLOW_PRESET_ULTRAFAST, **kwargs):
+        super().__init__(**kwargs)
+        self._dis = cv2.DISOpticalFlow_create(preset)
+
+    def _magnitude(self, prev_gray, gray):
+        # DIS rejects non-contiguous views such as ROI crops
+        flow = self._dis.calc(np.ascontiguousarray(prev_gray), np.ascontiguousarray(gray), None)
+        mag, _ = cv2.cartToPolar(flow[..., 0], flow[..., 1])
+        return mag
+
+
+class FrameDiffMotion(MotionEstimator):
+    name = "diff"
+    default_threshold = None  # intensity units; no calibrated value
+
+    def _magnitude(self, prev_gray, gray):
+        return cv2.absdiff(prev_gray, gray).astype(np.float32)
+
+    def _unit_scale(self):
+        return 1.0  # intensity difference does not scale with resolution
+
+
+MOTION_BACKENDS = {
+    FarnebackMotion.name: FarnebackMotion,
+    DISMotion.name: DISMotion,
+    FrameDiffMotion.name: FrameDiffMotion,
+}
+
+
+def default_threshold(name):
+    """Calibrated motion_threshold for a backend; ValueError if it has none"""
+    try:
+        threshold = MOTION_BACKENDS[name].default_threshold
+    except KeyError:
+        raise ValueError(f"Unknown motion backend: {name} (choose from {', '.join(MOTION_BACKENDS)})")
+    if threshold is None:
+        raise ValueError(f"Motion backend {name} has no default threshold; set motion_threshold for it")
+    return threshold
+
+
+def get_motion_estimator(name="farneback", **options):
+    """Build a motion estimator by backend name; options go to its constructor"""
+    try:
+        cls = MOTION_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown motion backend: {name} (choose from {', '.join(MOTION_BACKENDS)})")
+    return cls(**options)
@@ -1,7 +1,10 @@
 # planting/video_processing/verify_video.py
-import os, cv2, numpy as np
-from object_detection.detect_objects import Detector, detect_green_blob
-from utils.cleanup import ensure_empty_dir
+import os, math, threading, cv2, numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from object_detection.detect_objects import get_detector, detect_green_blob
+from video_processing.motion import get_motion_estimator
+from video_processing.extract_frames import SampledFrame
 
 def mean_optical_flow(prev_gray, gray, roi=None):
     flow = cv2.calcOpticalFlowFarneback(prev_gray, gray, None,
@@ -21,65 +24,233 @@ def mean_optical_flow(prev_gray, gray, roi=None):
         crop = mag
     return float(np.mean(crop))
 
-def verify_planting_from_frames(frames_folder, min_plant_frames=1, motion_threshold=0.8):
-    detector = Detector()
+def verify_planting_from_frames(frames_folder, min_plant_frames=1, motion_threshold=0.8, detector=None, batch_size=8,
+                                workers=1):
+    """Verify planting from a folder of JPEG frames (see verify_planting_from_stream)"""
     frame_files = sorted([os.path.join(frames_folder,f) for f in os.listdir(frames_folder) if f.lower().endswith(".jpg")])
     if not frame_files:
         return False, {"reason": "no_frames"}
+    frames = (cv2.imread(fp) for fp in frame_files)
+    return verify_planting_from_stream(frames, min_plant_frames=min_plant_frames,
+                                       motion_threshold=motion_threshold, detector=detector,
+                                       batch_size=batch_size, workers=workers)
 
-    prev_gray = None
-    person_frames = []
-    plant_frames = []
-    motion_scores = []
+def _chunks(frames, size):
+    chunk = []
+    for frame in frames:
+        chunk.append(frame)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def analyse_frame(img, dets):
+    """
+    Per-frame evidence from one frame and its detections.
+    Returns (person_bbox or None, plant_found, gray).
+    """
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    persons = [d for d in dets if 'person' in d['label'].lower()]
+    plants = [d for d in dets if ('plant' in d['label'].lower() or 'potted' in d['label'].lower() or 'tree' in d['label'].lower())]
+
+    person_bbox = None
+    if persons:
+        person = max(persons, key=lambda d: (d['xyxy'][2]-d['xyxy'][0])*(d['xyxy'][3]-d['xyxy'][1]))
+        person_bbox = person['xyxy']
+
+    if plants:
+        plant_found = True
+    elif person_bbox is not None:
+        # fallback: green blob near person's lower area
+        x1,y1,x2,y2 = person_bbox
+        h = img.shape[0]
+        roi = (max(0,x1-20), min(h-1,y2), min(img.shape[1], x2+20), min(h, y2 + (y2-y1)//2 + 30))
+        plant_found = detect_green_blob(img, roi=roi, min_area_px=150)
+    else:
+        plant_found = detect_green_blob(img, roi=None, min_area_px=800)
+    return person_bbox, plant_found, gray
+
+def _analyse_chunk(detector, chunk, batch_size):
+    """analyse_frame for every frame of chunk (None stays None), one detect_batch call"""
+    images = [img for img in chunk if img is not None]
+    dets_per_frame = iter(detector.detect_batch(images, batch_size=batch_size))
+    return [None if img is None else analyse_frame(img, next(dets_per_frame)) for img in chunk]
+
+# Persistent per-frame analysis threads, one pool per worker count. cv2 and
+# torch release the GIL, so chunks really run in parallel; each thread keeps
+# its own Detector clone because ultralytics models are not thread-safe.
+_FRAME_POOLS = {}
+_FRAME_POOLS_LOCK = threading.Lock()
+_thread_state = threading.local()
+
+def _frame_pool(workers):
+    with _FRAME_POOLS_LOCK:
+        pool = _FRAME_POOLS.get(workers)
+        if pool is None:
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="planting-frames")
+            _FRAME_POOLS[workers] = pool
+    return pool
 
-    for idx, fp in enumerate(frame_files):
-        img = cv2.imread(fp)
-        if img is None:
-            continue
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+def _thread_detector(detector):
+    clones = getattr(_thread_state, "detectors", None)
+    if clones is None:
+        clones = _thread_state.detectors = {}
+    clone = clones.get(id(detector))
+    if clone is None:
+        clone = clones[id(detector)] = detector.clone()
+    return clone
 
-        dets = detector.detect(img) if detector.model is not None else []
-        persons = [d for d in dets if 'person' in d['label'].lower()]
-        plants = [d for d in dets if ('plant' in d['label'].lower() or 'potted' in d['label'].lower() or 'tree' in d['label'].lower())]
+def _analyse_chunk_threaded(detector, chunk, batch_size):
+    return _analyse_chunk(_thread_detector(detector), chunk, batch_size)
 
-        person_bbox = None
-        if persons:
-            person = max(persons, key=lambda d: (d['xyxy'][2]-d['xyxy'][0])*(d['xyxy'][3]-d['xyxy'][1]))
-            person_frames.append(idx)
-            person_bbox = person['xyxy']
+def _analysed_chunks(frames, detector, batch_size, workers):
+    """
+    Yield (chunk, analyses) in frame order. With workers > 1, up to workers
+    chunks are analysed concurrently while the caller consumes earlier ones;
+    closing the generator cancels chunks that have not started.
+    """
+    if workers <= 1:
+        for chunk in _chunks(frames, batch_size):
+            yield chunk, _analyse_chunk(detector, chunk, batch_size)
+        return
 
-        if plants:
-            plant_frames.append(idx)
+    pool = _frame_pool(workers)
+    pending = deque()
+    try:
+        for chunk in _chunks(frames, batch_size):
+            pending.append((chunk, pool.submit(_analyse_chunk_threaded, detector, chunk, batch_size)))
+            if len(pending) > workers:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+def _images(frames, metas):
+    """Bare images for analysis; SampledFrame extras (or None) queued on metas in the same order"""
+    for item in frames:
+        if isinstance(item, SampledFrame):
+            metas.append(item)
+            yield item.image
         else:
-            # fallback: green blob near person's lower area
+            metas.append(None)
+            yield item
+
+def _mean_motion(motion_scores, motion_weights, span=None):
+    """Weighted mean motion; with span (seconds), motion integrated over time / span"""
+    total = span or sum(motion_weights)
+    if not total:
+        return 0.0
+    return float(sum(m * w for m, w in zip(motion_scores, motion_weights)) / total)
+
+def _evidence_sufficient(person_frames, plant_frames, motion_scores, motion_weights, motion_span,
+                         min_plant_frames, motion_threshold, margin, min_motion_samples):
+    """True once every pass criterion is met with the given safety margin"""
+    if len(motion_scores) < min_motion_samples:
+        return False
+    if len(person_frames) < math.ceil(1 * (1 + margin)):
+        return False
+    if len(plant_frames) < math.ceil(min_plant_frames * (1 + margin)):
+        return False
+    return _mean_motion(motion_scores, motion_weights, motion_span) >= motion_threshold * (1 + margin)
+
+def verify_planting_from_stream(frames, min_plant_frames=1, motion_threshold=0.8, detector=None, batch_size=8,
+                                early_exit=False, early_exit_margin=0.25, min_motion_samples=5,
+                                motion_estimator=None, workers=1):
+    """
+    Verify planting from an iterable of decoded BGR frames, e.g.
+    video_processing.extract_frames.iter_frames(video_path). Frames are
+    consumed batch_size at a time and detected in one forward pass per batch;
+    None entries are counted but skipped.
+    Motion is measured between consecutive frames, except for SampledFrame
+    entries (keyframe sampler): those are measured against their own
+    reference frame and avg_motion is their motion integrated over time,
+    divided by the video duration (see extract_frames.iter_keyframes).
+    early_exit: stop pulling frames as soon as the pass criteria hold with
+    early_exit_margin to spare (counts and mean motion scaled by 1 + margin,
+    after at least min_motion_samples motion samples). evidence["num_frames"]
+    is the number of frames actually analysed.
+    motion_estimator: a backend name or estimator from video_processing.motion;
+    defaults to full-frame Farneback (mean_optical_flow).
+    workers: threads for per-frame analysis (detection, green blob fallback);
+    motion between consecutive frames is still measured in frame order, so
+    the result does not depend on the worker count.
+    """
+    if detector is None:
+        detector = get_detector()
+    if motion_estimator is None:
+        motion_estimator = mean_optical_flow
+    elif isinstance(motion_estimator, str):
+        motion_estimator = get_motion_estimator(motion_estimator)
+    stopped_early = False
+
+    prev_gray = None
+    person_frames = []
+    plant_frames = []
+    motion_scores = []
+    motion_weights = []
+    motion_span = None  # video seconds, for SampledFrame streams
+    num_frames = 0
+
+    metas = deque()
+    chunks = _analysed_chunks(_images(frames, metas), detector, batch_size, workers)
+    for chunk, analyses in chunks:
+        for analysis in analyses:
+            idx = num_frames
+            num_frames += 1
+            meta = metas.popleft()
+            if analysis is None:
+                continue
+            person_bbox, plant_found, gray = analysis
             if person_bbox is not None:
-                x1,y1,x2,y2 = person_bbox
-                h = img.shape[0]
-                roi = (max(0,x1-20), min(h-1,y2), min(img.shape[1], x2+20), min(h, y2 + (y2-y1)//2 + 30))
-                if detect_green_blob(img, roi=roi, min_area_px=150):
-                    plant_frames.append(idx)
-            else:
-                if detect_green_blob(img, roi=None, min_area_px=800):
-                    plant_frames.append(idx)
-
-        if prev_gray is not None:
+                person_frames.append(idx)
+            if plant_found:
+                plant_frames.append(idx)
+
             # measure motion around person if exists else whole frame
+            roi = None
             if person_bbox is not None:
                 x1,y1,x2,y2 = person_bbox
                 ry1 = y1 + (y2-y1)//2
                 roi = (x1, ry1, x2, y2)
-                motion = mean_optical_flow(prev_gray, gray, roi=roi)
-            else:
-                motion = mean_optical_flow(prev_gray, gray, roi=None)
-            motion_scores.append(motion)
-        prev_gray = gray
+            if meta is not None:
+                motion_span = meta.duration
+                if meta.ref is not None:
+                    ref_gray = cv2.cvtColor(meta.ref, cv2.COLOR_BGR2GRAY)
+                    motion_scores.append(motion_estimator(ref_gray, gray, roi=roi))
+                    motion_weights.append(meta.weight)
+            elif prev_gray is not None:
+                motion_scores.append(motion_estimator(prev_gray, gray, roi=roi))
+                motion_weights.append(1.0)
+            prev_gray = gray
+
+            if early_exit and _evidence_sufficient(person_frames, plant_frames, motion_scores, motion_weights,
+                                                   motion_span, min_plant_frames, motion_threshold, early_exit_margin,
+                                                   min_motion_samples):
+                stopped_early = True
+                break
+        if stopped_early:
+            break
+
+    if stopped_early:
+        chunks.close()  # cancel queued chunk analysis
+    if stopped_early and hasattr(frames, "close"):
+        frames.close()  # stop decoding (releases the capture in iter_frames)
+
+    if num_frames == 0:
+        return False, {"reason": "no_frames"}
 
     evidence = {
-        "num_frames": len(frame_files),
+        "num_frames": num_frames,
         "person_frames": person_frames,
         "plant_frames": plant_frames,
-        "avg_motion": float(sum(motion_scores)/len(motion_scores)) if motion_scores else 0.0,
-        "motion_samples": motion_scores[:10]
+        "avg_motion": _mean_motion(motion_scores, motion_weights, motion_span),
+        "motion_samples": motion_scores[:10],
+        "early_exit": stopped_early
     }
 
     if not person_frames:
@@ -92,10 +263,9 @@ def verify_planting_from_frames(frames_folder, min_plant_frames=1, motion_thresh
     return True, {"reason":"planting_verified", **evidence}
 
 if __name__ == "__main__":
-    # quick local run: extract frames then verify
-    from video_processing.extract_frames import extract_frames
-    ensure_empty_dir("uploads/frames")
-    frames = extract_frames("uploads/videos/demo_video.mp4", out_dir="uploads/frames", sample_fps=1, max_frames=30)
-    ok, info = verify_planting_from_frames("uploads/frames", min_plant_frames=1, motion_threshold=0.6)
+    # quick local run: stream frames straight from the video into verification
+    from video_processing.extract_frames import iter_frames
+    frames = iter_frames("uploads/videos/demo_video.mp4", sample_fps=1, max_frames=30)
+    ok, info = verify_planting_from_stream(frames, min_plant_frames=1, motion_threshold=0.6)
     print("PASS:", ok)
     print(info)
@@ -0,0 +1,122 @@
+"""
+Content-addressed result cache for the verification endpoints.
+
+Keys are a SHA-256 over the endpoint namespace, the model version, the
+verification thresholds and the raw input bytes, so a resubmitted photo or
+video returns the stored response without running inference again.
+Entries are evicted least-recently-used when either the entry count or the
+(approximate, JSON-size) memory bound is exceeded, and expire after ttl_s.
+"""
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_stream(stream):
+    """SHA-256 digest of a seekable stream from its current position; rewinds it afterwards"""
+    start = stream.tell()
+    h = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(HASH_CHUNK_SIZE), b""):
+        h.update(chunk)
+    stream.seek(start)
+    return h.digest()
+
+
+def model_version(path):
+    """Cheap version tag for a weights file or SavedModel directory (size + mtime)"""
+    if os.path.isdir(path):
+        path = os.path.join(path, "saved_model.pb")
+    try:
+        st = os.stat(path)
+    except OSError:
+        return os.path.basename(str(path))
+    return f"{os.path.basename(str(path))}:{st.st_size}:{st.st_mtime_ns}"
+
+
+class ResultCache:
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024, ttl_s=3600.0):
+        self.max_entries = int(max_entries)
+        self.max_bytes = int(max_bytes)
+        self.ttl_s = float(ttl_s)
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(namespace, version, params, *parts):
+        """
+        namespace: endpoint name; version: model version tag;
+        params: JSON-serialisable thresholds; parts: input bytes or digests
+        """
+        h = hashlib.sha256()
+        header = json.dumps([namespace, version, params], sort_keys=True, default=str)
+        h.update(header.encode("utf-8"))
+        for part in parts:
+            h.update(len(part).to_bytes(8, "little"))
+            h.update(part)
+        return h.hexdigest()
+
+    def get(self, key):
+        """Cached value (a copy) or None"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, size, expires_at = entry
+            if expires_at <= now:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(value)
+
+    def put(self, key, value):
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.monotonic() + self.ttl_s)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_s": self.ttl_s,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }